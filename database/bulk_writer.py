@@ -0,0 +1,93 @@
+import sqlite3
+import time
+from itertools import islice
+from typing import Callable, Iterable, NamedTuple
+from database.sql_utils import quote_identifier
+
+
+class WriteStats(NamedTuple):
+    """
+    How much a bulk write did and how long it took.
+    """
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+def build_insert_statement(table: str, column_names: list, with_rowid: bool = False) -> str:
+    """
+    Build a parameterized INSERT statement for a table.
+
+    :param table: The name of the table.
+    :param column_names: The columns that receive values, in order.
+    :param with_rowid: Take an explicit rowid as the first value.
+    :return: The SQL statement.
+    """
+    columns = [quote_identifier(name) for name in column_names]
+    if with_rowid:
+        columns.insert(0, "rowid")
+    placeholders = ", ".join("?" for _ in columns)
+    return f"INSERT INTO {quote_identifier(table)} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+def build_update_statement(table: str, column_names: list) -> str:
+    """
+    Build a parameterized UPDATE statement that rewrites one row, selected by rowid.
+
+    The values are bound in column order, followed by the rowid.
+
+    :param table: The name of the table.
+    :param column_names: The columns to update, in order.
+    :return: The SQL statement.
+    """
+    assignments = ", ".join(f"{quote_identifier(name)} = ?" for name in column_names)
+    return f"UPDATE {quote_identifier(table)} SET {assignments} WHERE rowid = ?"
+
+
+def bulk_insert(connection: sqlite3.Connection, statement: str, rows: Iterable, chunk_size: int,
+                on_chunk: Callable[[int], None] = None, atomic: bool = False) -> WriteStats:
+    """
+    Insert rows with executemany, committing one transaction per chunk.
+
+    Rows are pulled from the iterable one chunk at a time, so a generator never has to be
+    materialized in full. A transaction that is already open, for example one holding a
+    DELETE that must not be committed on its own, becomes part of the first chunk.
+
+    When the rows replace what the table held, pass atomic=True: every chunk then goes into
+    a single transaction, committed after the last one, so a failure part way through rolls
+    back to the old rows instead of leaving the table cut short.
+
+    :param connection: Connection to the database.
+    :param statement: A parameterized INSERT statement, such as one from build_insert_statement.
+    :param rows: Iterable of value sequences matching the statement's placeholders.
+    :param chunk_size: The number of rows to insert per executemany call, and per transaction
+        unless atomic is set.
+    :param on_chunk: Called with the number of rows in each chunk after it is written.
+    :param atomic: Write every chunk in one transaction.
+    :return: The number of rows written and the time it took.
+    """
+    rows = iter(rows)
+    written = 0
+    start = time.perf_counter()
+    try:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            if not connection.in_transaction:
+                connection.execute("BEGIN")
+            connection.executemany(statement, chunk)
+            if not atomic:
+                connection.commit()
+            written += len(chunk)
+            if on_chunk:
+                on_chunk(len(chunk))
+    except BaseException:
+        connection.rollback()
+        raise
+    if connection.in_transaction:
+        connection.commit()
+    return WriteStats(written, time.perf_counter() - start)
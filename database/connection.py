@@ -0,0 +1,96 @@
+import sqlite3
+from urllib.request import pathname2url
+
+
+# Pragma presets for the 'connection_profile' setting
+CONNECTION_PROFILES = {
+    # Durable: every commit is synced to disk before it returns. The journal mode is left
+    # as each database has it, since WAL would persist in the file and add -wal and -shm
+    # files beside it.
+    "safe": {
+        "synchronous": "FULL",
+        "cache_size": -16000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+    # Fast imports and large reads: a power loss can lose the most recent commits. Switches
+    # databases to WAL journaling, which stays set in the file.
+    "bulk load": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262144,
+        "mmap_size": 1073741824,
+        "temp_store": "MEMORY",
+    },
+}
+
+DEFAULT_CONNECTION_PROFILE = "safe"
+
+# Pragma values cannot be bound as parameters, so only known values are accepted
+PRAGMA_CHOICES = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+INTEGER_PRAGMAS = {"cache_size", "mmap_size"}
+
+# Pragmas that only matter for connections that write
+WRITE_PRAGMAS = {"journal_mode", "synchronous"}
+
+
+def apply_connection_profile(connection: sqlite3.Connection, profile: dict, read_only: bool = False) -> None:
+    """
+    Set the pragmas from a connection profile on a connection.
+
+    :param connection: The connection to tune.
+    :param profile: Mapping of pragma name to value, such as one of CONNECTION_PROFILES.
+    :param read_only: Skip the pragmas that only matter when writing.
+    :raises ValueError: If the profile contains an unknown pragma or value.
+    """
+    for pragma, value in (profile or {}).items():
+        if read_only and pragma in WRITE_PRAGMAS:
+            continue
+        if pragma in INTEGER_PRAGMAS:
+            value = int(value)
+        elif pragma in PRAGMA_CHOICES and str(value).upper() in PRAGMA_CHOICES[pragma]:
+            value = str(value).upper()
+        else:
+            raise ValueError(f"Unsupported connection setting: {pragma} = {value}")
+        connection.execute(f"PRAGMA {pragma} = {value}")
+
+
+def open_connection(db_path: str, profile: dict = None) -> sqlite3.Connection:
+    """
+    Open a read-write connection to a database file and apply a connection profile.
+
+    :param db_path: Path to the database file.
+    :param profile: Mapping of pragma name to value.
+    :return: The new connection.
+    """
+    connection = sqlite3.connect(db_path)
+    try:
+        apply_connection_profile(connection, profile)
+    except (sqlite3.Error, ValueError):
+        connection.close()
+        raise
+    return connection
+
+
+def open_read_only(db_path: str, profile: dict = None) -> sqlite3.Connection:
+    """
+    Open a read-only connection to a database file.
+
+    Read-only connections are safe to hand to worker threads and processes: each worker
+    gets its own connection and none of them can modify the database.
+
+    :param db_path: Path to the database file.
+    :param profile: Mapping of pragma name to value. Only the read-side pragmas are applied.
+    :return: The new connection.
+    """
+    connection = sqlite3.connect(f"file:{pathname2url(db_path)}?mode=ro", uri=True, check_same_thread=False)
+    try:
+        apply_connection_profile(connection, profile, read_only=True)
+    except (sqlite3.Error, ValueError):
+        connection.close()
+        raise
+    return connection
@@ -1,10 +1,17 @@
 import sqlite3
 import os
+from itertools import islice
 from rich.console import Console
 from message_panel.message_panel import MessagePanel
 from autocomplete.autocomplete import Autocomplete
-from rich.panel import Panel
+from rich.table import Table
+from rich.markup import escape
+from rich.progress import Progress
 from settings.settings import Settings
+from database.search_engine import SearchEngine, search_tables_parallel, search_databases_parallel
+from database.search_index import SearchIndex
+from database.schema_cache import SchemaCache
+from database.connection import open_connection
 
 class Database:
     def __init__(self, console: Console, settings: Settings):
@@ -18,8 +25,10 @@ class Database:
         self.message_panel = MessagePanel(self.console)
         self.autocomplete = Autocomplete(self.console)
         self.current_database = None
+        self.database_path = None
         self.connection = None
         self.cursor = None
+        self.schema_cache = None
         self.database_directory = os.path.join(os.getcwd(), "databases")
         self.ensure_database_directory()
         
@@ -39,8 +48,7 @@ class Database:
                 return
 
             # Fetch all table names in the database
-            self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = [row[0] for row in self.cursor.fetchall()]
+            tables = self.get_tables()
 
             if not tables:
                 self.message_panel.create_error_message("No tables found in the database.")
@@ -62,53 +70,245 @@ class Database:
                 self.message_panel.create_error_message("Invalid table number.")
                 return
 
-            # Perform the search
-            results = []
-            for table in target_tables:
-                # Fetch column information with data types
-                self.cursor.execute(f'PRAGMA table_info("{table}");')
-                columns_info = self.cursor.fetchall()
-                columns = [{"name": col[1], "type": col[2]} for col in columns_info]
-
-                # Safely quote the table name
-                quoted_table_name = f'"{table}"'
-                self.cursor.execute(f"SELECT * FROM {quoted_table_name}")
-                rows = self.cursor.fetchall()
-
-                # Search each row and column for the search string
-                for row_idx, row in enumerate(rows, start=1):
-                    for col_idx, value in enumerate(row):
-                        if search_string.lower() in str(value).lower():
-                            column = columns[col_idx]
-                            results.append((table, row_idx, column["name"], column["type"], value))
-
-            # Display the results
-            if not results:
-                self.message_panel.create_information_message(f"No matches found for '[bold cyan]{search_string}[/]'.")
+            # Let SQLite filter the rows; only the matching cells come back, and the
+            # search stops as soon as the result limit is reached
+            limit = self.settings.get_search_result_limit()
+            # Workers read through their own connections, so while this connection has
+            # changes it has not committed, the tables are searched on it instead
+            if len(target_tables) > 1 and not self.connection.in_transaction:
+                hits = self.search_tables_in_parallel(target_tables, search_string, limit)
+            else:
+                search_engine = SearchEngine(self.connection, self.schema_cache)
+                hits = islice(search_engine.search(target_tables, search_string), limit)
+            self.display_search_results(hits, search_string, limit)
+
+        except (sqlite3.Error, ValueError) as e:
+            self.message_panel.create_error_message(f"Search query failed: {e}")
+
+
+
+    def global_search(self):
+        """
+        Search every table of every database in the 'databases' directory at once.
+        """
+        databases = self.get_database_files()
+        if not databases:
+            self.message_panel.create_error_message("No databases found.")
+            return
+
+        search_string = self.console.input("[bold yellow]Enter the search query[/]: ").strip()
+        if not search_string:
+            self.message_panel.create_error_message("Search query cannot be empty.")
+            return
+
+        limit = self.settings.get_search_result_limit()
+        db_paths = [os.path.join(self.database_directory, db) for db in databases]
+        skipped = []
+        try:
+            with Progress(console=self.console, transient=True) as progress:
+                task = progress.add_task("[bold yellow]Searching databases[/]", total=len(db_paths))
+
+                def on_database_done(db_path: str, hit_count: int):
+                    progress.update(task, advance=1, description=f"[bold yellow]Searched[/] [bold cyan]{escape(os.path.basename(db_path))}[/] ({hit_count} hits)")
+
+                def on_database_skipped(db_path: str, error: Exception):
+                    skipped.append((os.path.basename(db_path), error))
+                    progress.update(task, advance=1)
+
+                hits = search_databases_parallel(db_paths, search_string, limit, on_database_done,
+                                                 self.settings.get_connection_profile(), on_database_skipped)
+                hits = list(islice(hits, limit))
+        except (sqlite3.Error, ValueError) as e:
+            self.message_panel.create_error_message(f"Global search failed: {e}")
+            return
+
+        if skipped:
+            details = "\n".join(f"[bold cyan]{escape(name)}[/]: {escape(str(error))}" for name, error in sorted(skipped))
+            self.message_panel.create_error_message(f"Skipped databases that could not be read:\n{details}")
+
+        self.display_search_results(hits, search_string, limit)
+
+    def search_tables_in_parallel(self, tables: list, search_string: str, limit: int) -> list:
+        """
+        Search several tables at once, showing progress as each table finishes.
+
+        :param tables: The names of the tables to search.
+        :param search_string: The string to look for.
+        :param limit: The maximum number of hits to collect.
+        :return: The hits, ordered by table and then by rowid.
+        """
+        with Progress(console=self.console, transient=True) as progress:
+            task = progress.add_task("[bold yellow]Searching tables[/]", total=len(tables))
+
+            def on_table_done(table: str, hit_count: int):
+                progress.update(task, advance=1, description=f"[bold yellow]Searched[/] [bold cyan]{escape(table)}[/] ({hit_count} hits)")
+
+            columns = {table: self.schema_cache.get_columns(table) for table in tables}
+            hits = search_tables_parallel(self.database_path, tables, search_string, limit, on_table_done,
+                                          self.settings.get_connection_profile(), columns)
+            return list(islice(hits, limit))
+
+    def display_search_results(self, hits, search_string: str, limit: int):
+        """
+        Show search results one page at a time, pulling only as many hits as each page needs.
+
+        :param hits: Iterator of search hits.
+        :param search_string: The search query, for the results title.
+        :param limit: The result limit the hits were capped at.
+        """
+        page_size = self.settings.get_search_page_size()
+        hits = iter(hits)
+        page = list(islice(hits, page_size))
+
+        if not page:
+            self.message_panel.create_information_message(f"No matches found for '[bold cyan]{search_string}[/]'.")
+            return
+
+        shown = 0
+        while page:
+            # Fetch the next page first so the prompt only appears when there is one
+            next_page = list(islice(hits, page_size))
+            self.console.print(self.build_results_table(page, search_string, shown))
+            shown += len(page)
+
+            if not next_page:
+                if shown >= limit:
+                    self.message_panel.create_information_message(
+                        f"Stopped after [bold cyan]{shown}[/] results. Change 'search_result_limit' in the settings to see more."
+                    )
+                else:
+                    self.message_panel.create_information_message(f"Showing all [bold cyan]{shown}[/] results.")
+                return
+
+            response = self.console.input(
+                "[bold yellow]Press Enter for the next page or 'q' to stop[/]: "
+            ).strip().lower()
+            if response == "q":
                 return
+            page = next_page
+
+    @staticmethod
+    def build_results_table(page: list, search_string: str, start: int) -> Table:
+        """
+        Build a compact table for one page of search results.
+
+        :param page: The search hits on this page.
+        :param search_string: The search query, for the table title.
+        :param start: The number of results shown on earlier pages.
+        :return: The rendered results table.
+        """
+        show_database = any(hit.database for hit in page)
+
+        table = Table(title=f"Search Results for '{escape(search_string)}'", border_style="cyan")
+        table.add_column("#", style="bold red", justify="right")
+        if show_database:
+            table.add_column("Database", style="bold cyan")
+        table.add_column("Table", style="cyan")
+        table.add_column("Row ID", style="magenta", justify="right")
+        table.add_column("Column", style="cyan")
+        table.add_column("Type", style="green")
+        table.add_column("Value", style="yellow", overflow="fold")
+
+        for number, hit in enumerate(page, start=start + 1):
+            cells = [str(number)]
+            if show_database:
+                cells.append(escape(hit.database))
+            cells += [escape(hit.table), str(hit.rowid), escape(hit.column), escape(hit.type or ""), escape(str(hit.value))]
+            table.add_row(*cells)
+        return table
+
+    def get_tables(self) -> list:
+        """
+        Get the names of the user tables in the connected database.
+
+        :return: The list of table names.
+        """
+        return self.schema_cache.get_tables()
 
-            self.console.print(f"[bold green]Search Results for '[bold cyan]{search_string}[/]':[/]")
-            for table, row_idx, column_name, column_type, value in results:
-                self.console.print(Panel(
-                    f"""
-    [bold red]Table[/]: [bold cyan]{table}[/]
+    def get_columns(self, table: str) -> list:
+        """
+        Get the names and declared SQL types of a table's columns in the connected database.
+
+        :param table: The name of the table.
+        :return: A list of dictionaries with the column name and type.
+        """
+        return self.schema_cache.get_columns(table)
+
+    def get_row_count(self, table: str) -> int:
+        """
+        Get the number of rows in a table in the connected database.
+
+        :param table: The name of the table.
+        :return: The row count.
+        """
+        return self.schema_cache.get_row_count(table)
+
+    def select_table(self, prompt: str):
+        """
+        Print the tables in the connected database and let the user pick one.
+
+        :param prompt: The prompt to show when asking for the table number.
+        :return: The selected table name, or None if nothing valid was selected.
+        """
+        tables = self.get_tables()
+        if not tables:
+            self.message_panel.create_error_message("No tables found in the database.")
+            return None
 
-    [bold red]Row[/]: [bold cyan]{row_idx}[/]
+        self.console.print("[bold green]Available Tables:[/]")
+        for idx, table in enumerate(tables, start=1):
+            self.console.print(f"{idx}. {table}")
 
-    [bold red]Column[/]: [bold cyan]{column_name}[/]
+        try:
+            table_number = int(self.console.input(f"[bold yellow]{prompt}[/]: ")) - 1
+        except ValueError:
+            self.message_panel.create_error_message("Invalid input. Please enter a valid number.")
+            return None
 
-    [bold red]Type[/]: [bold cyan]{column_type}[/]
+        if not (0 <= table_number < len(tables)):
+            self.message_panel.create_error_message("Invalid table number.")
+            return None
+        return tables[table_number]
 
-    [bold red]Value[/]: [bold cyan]{value}[/]
-                    """,
-                    title="[bold red]Results[/]",
-                    title_align="center",
-                    border_style="cyan"))
+    def build_search_index(self):
+        """
+        Build a full-text search index for a table so searches on it no longer scan every row.
+        """
+        if not self.is_connected():
+            self.message_panel.create_error_message("No database is connected. Please connect to a database first.")
+            return
 
+        table = self.select_table("Enter the number of the table to index")
+        if table is None:
+            return
+
+        try:
+            SearchIndex(self.connection).build(table)
+            self.message_panel.create_information_message(f"Search index built for table '[bold cyan]{table}[/]'.")
         except sqlite3.Error as e:
-            self.message_panel.create_error_message(f"Search query failed: {e}")
+            self.message_panel.create_error_message(f"Failed to build search index: {e}")
 
+    def drop_search_index(self):
+        """
+        Remove the full-text search index from a table.
+        """
+        if not self.is_connected():
+            self.message_panel.create_error_message("No database is connected. Please connect to a database first.")
+            return
 
+        table = self.select_table("Enter the number of the table to remove the index from")
+        if table is None:
+            return
+
+        search_index = SearchIndex(self.connection)
+        try:
+            if not search_index.exists(table):
+                self.message_panel.create_error_message(f"Table '[bold cyan]{table}[/]' has no search index.")
+                return
+            search_index.drop(table)
+            self.message_panel.create_information_message(f"Search index dropped for table '[bold cyan]{table}[/]'.")
+        except sqlite3.Error as e:
+            self.message_panel.create_error_message(f"Failed to drop search index: {e}")
 
     def ensure_database_directory(self):
         """
@@ -127,11 +327,13 @@ class Database:
             self.message_panel.create_error_message(f"Database '[bold cyan]{db_name}[/]' does not exist in the 'databases' directory.")
             return
         try:
-            self.connection = sqlite3.connect(db_path)
+            self.connection = open_connection(db_path, self.settings.get_connection_profile())
             self.cursor = self.connection.cursor()
+            self.schema_cache = SchemaCache(self.connection)
             self.current_database = db_name
+            self.database_path = db_path
             self.message_panel.create_information_message(f"Connected to database: [bold cyan]{db_name}[/]")
-        except sqlite3.Error as e:
+        except (sqlite3.Error, ValueError) as e:
             self.message_panel.create_error_message(f"Failed to connect to database: {e}")
 
     def close(self):
@@ -142,7 +344,9 @@ class Database:
             self.connection.close()
             self.connection = None
             self.cursor = None
+            self.schema_cache = None
             self.current_database = None
+            self.database_path = None
             self.message_panel.create_information_message("Database connection closed.")
 
     def get_current_database(self):
@@ -181,18 +385,28 @@ class Database:
             self.message_panel.create_error_message("Database does not exist.")
             return
         try:
-            os.remove(db_path)
-            self.message_panel.create_information_message(f"Database deleted: [bold cyan]{db_name}[/]")
             if self.current_database == db_name:
                 self.close()
+            os.remove(db_path)
+            # Remove the write-ahead log files left by WAL journaling
+            for suffix in ("-wal", "-shm"):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+            self.message_panel.create_information_message(f"Database deleted: [bold cyan]{db_name}[/]")
         except Exception as e:
             self.message_panel.create_error_message(f"Failed to delete database: {e}")
 
+    def get_database_files(self) -> list:
+        """
+        Get the file names of the SQLite databases in the 'databases' directory, sorted by name.
+        """
+        return sorted(f for f in os.listdir(self.database_directory) if f.endswith('.db'))
+
     def list_databases(self):
         """
         List all SQLite databases in the 'databases' directory.
         """
-        databases = [f for f in os.listdir(self.database_directory) if f.endswith('.db')]
+        databases = self.get_database_files()
         if not databases:
             self.message_panel.create_error_message("No databases found.")
             return []
@@ -259,6 +473,15 @@ class Database:
             elif command == "search":
                 self.search()
 
+            elif command == "global search":
+                self.global_search()
+
+            elif command == "build index":
+                self.build_search_index()
+
+            elif command == "drop index":
+                self.drop_search_index()
+
             elif command == "help":
                 self.message_panel.print_database_instructions()
 
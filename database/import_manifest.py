@@ -0,0 +1,190 @@
+import hashlib
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+from database.sql_utils import quote_identifier, list_user_tables, INTERNAL_TABLE_PREFIX
+
+
+MANIFEST_TABLE = INTERNAL_TABLE_PREFIX + "import_manifest"
+
+# Files are imported into a staging table that only replaces the real one once complete
+STAGING_TABLE_PREFIX = INTERNAL_TABLE_PREFIX + "staging_"
+
+# Bytes read at a time while hashing a file
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# hashlib releases the GIL on large blocks, so files are hashed on threads
+MAX_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+
+class ManifestEntry(NamedTuple):
+    """
+    A file that was imported into a table, as it was when it was imported.
+    """
+    path: str
+    size: int
+    mtime: float
+    hash: str
+    table_name: str
+    rows: int
+
+
+def hash_file(path: str) -> str:
+    """
+    Get the SHA-256 hash of a file's contents.
+
+    :param path: Path to the file.
+    :return: The hash as a hex string.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        while block := file.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_files(paths: list) -> list:
+    """
+    Hash several files at once on a thread pool.
+
+    :param paths: Paths to the files.
+    :return: The hashes, in the same order as the paths.
+    """
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(MAX_HASH_WORKERS, len(paths))) as executor:
+        return list(executor.map(hash_file, paths))
+
+
+class ImportManifest:
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        Keep track of which files have been imported into a database, and into which tables.
+
+        The manifest is a table inside the database itself, so it travels with the data it
+        describes. Each file is recorded under its absolute path with the size, modification
+        time and content hash it had when it was imported, so an unchanged file can be
+        recognized and skipped on the next import.
+
+        :param connection: Connection to the database the files are imported into.
+        """
+        self.connection = connection
+        with self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {quote_identifier(MANIFEST_TABLE)} ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime REAL, hash TEXT, table_name TEXT, rows INTEGER)"
+            )
+
+    @staticmethod
+    def normalize_path(path: str) -> str:
+        return os.path.abspath(path)
+
+    def get(self, path: str) -> ManifestEntry:
+        """
+        Get the manifest entry of a file.
+
+        :param path: Path to the file.
+        :return: The entry, or None if the file was never imported.
+        """
+        row = self.connection.execute(
+            f"SELECT path, size, mtime, hash, table_name, rows FROM {quote_identifier(MANIFEST_TABLE)} WHERE path = ?",
+            (self.normalize_path(path),)
+        ).fetchone()
+        return ManifestEntry(*row) if row else None
+
+    def get_table_names(self) -> set:
+        """
+        Get the names of every table the manifest has assigned to a file.
+        """
+        cursor = self.connection.execute(f"SELECT table_name FROM {quote_identifier(MANIFEST_TABLE)}")
+        return {row[0] for row in cursor}
+
+    @staticmethod
+    def staging_table(table_name: str) -> str:
+        """
+        Get the name of the table a file is imported into before it replaces its table.
+        """
+        return STAGING_TABLE_PREFIX + table_name
+
+    def drop_staging_tables(self) -> None:
+        """
+        Drop the staging tables left behind by an import that was interrupted.
+        """
+        cursor = self.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND substr(name, 1, ?) = ?",
+            (len(STAGING_TABLE_PREFIX), STAGING_TABLE_PREFIX)
+        )
+        with self.connection:
+            for (name,) in cursor.fetchall():
+                self.connection.execute(f"DROP TABLE {quote_identifier(name)}")
+
+    def record(self, entry: ManifestEntry) -> None:
+        """
+        Record that a file has been imported, replacing any earlier entry for it.
+
+        :param entry: The file as it was imported.
+        """
+        entry = entry._replace(path=self.normalize_path(entry.path))
+        with self.connection:
+            self.connection.execute(
+                f"INSERT OR REPLACE INTO {quote_identifier(MANIFEST_TABLE)} "
+                "(path, size, mtime, hash, table_name, rows) VALUES (?, ?, ?, ?, ?, ?)",
+                entry
+            )
+
+    def plan(self, paths: list, name_prefix: str = "Table_") -> tuple:
+        """
+        Work out which files need importing, and the table each one goes into.
+
+        A file is unchanged if its size and modification time match its entry, or, failing
+        that, if its content hash does; the entry's modification time is then brought up to
+        date. A file whose table has since been dropped is imported again. Files keep the
+        table they were first imported into, and new files get a table named after the
+        file, with a number added if that name is already taken.
+
+        :param paths: Paths to the files.
+        :param name_prefix: The prefix for the names of new tables.
+        :return: A list with a ManifestEntry for every file, holding its current size,
+            modification time and hash (None if it was not needed), and the set of paths
+            that are unchanged.
+        """
+        existing_tables = set(list_user_tables(self.connection))
+        entries = []
+        previous = []
+        for path in paths:
+            stat = os.stat(path)
+            entries.append(ManifestEntry(path, stat.st_size, stat.st_mtime, None, None, 0))
+            previous.append(self.get(path))
+
+        unchanged = set()
+        to_hash = []
+        for index, (entry, old) in enumerate(zip(entries, previous)):
+            if old is None or old.table_name not in existing_tables:
+                to_hash.append(index)
+            elif (old.size, old.mtime) == (entry.size, entry.mtime):
+                entries[index] = old._replace(path=entry.path)
+                unchanged.add(entry.path)
+            else:
+                to_hash.append(index)
+
+        taken = existing_tables | self.get_table_names()
+        for index, digest in zip(to_hash, hash_files([entries[index].path for index in to_hash])):
+            entry, old = entries[index]._replace(hash=digest), previous[index]
+            if old is not None and old.table_name in existing_tables and old.hash == digest:
+                entry = entry._replace(table_name=old.table_name, rows=old.rows)
+                self.record(entry)
+                unchanged.add(entry.path)
+            elif old is not None:
+                entry = entry._replace(table_name=old.table_name)
+            else:
+                base_name = f"{name_prefix}{os.path.splitext(os.path.basename(entry.path))[0]}"
+                table_name, number = base_name, 1
+                while table_name in taken:
+                    number += 1
+                    table_name = f"{base_name}_{number}"
+                taken.add(table_name)
+                entry = entry._replace(table_name=table_name)
+            entries[index] = entry
+
+        return entries, unchanged
@@ -0,0 +1,85 @@
+import sqlite3
+from database.sql_utils import quote_identifier, list_user_tables
+
+
+class SchemaCache:
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        Cache table names, column definitions and row counts for one connection.
+
+        Every lookup first reads PRAGMA schema_version and PRAGMA data_version, which are
+        cheap header reads. A change in schema_version (a table was created, altered or
+        dropped) clears everything. Row counts are also cleared when data_version changes
+        (another connection committed) or when this connection's total_changes moves (this
+        connection wrote rows), since data_version only tracks other connections.
+
+        :param connection: The connection whose schema is cached.
+        """
+        self.connection = connection
+        self.schema_version = None
+        self.data_key = None
+        self.tables = None
+        self.columns = {}
+        self.row_counts = {}
+
+    def refresh(self) -> None:
+        """
+        Drop any cached entries that may be out of date.
+        """
+        schema_version = self.connection.execute("PRAGMA schema_version").fetchone()[0]
+        if schema_version != self.schema_version:
+            self.invalidate()
+            self.schema_version = schema_version
+
+        data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        data_key = (data_version, self.connection.total_changes)
+        if data_key != self.data_key:
+            self.row_counts.clear()
+            self.data_key = data_key
+
+    def invalidate(self) -> None:
+        """
+        Forget everything that has been cached.
+        """
+        self.schema_version = None
+        self.data_key = None
+        self.tables = None
+        self.columns.clear()
+        self.row_counts.clear()
+
+    def get_tables(self) -> list:
+        """
+        Get the names of the user tables in the database.
+
+        :return: The list of table names.
+        """
+        self.refresh()
+        if self.tables is None:
+            self.tables = list_user_tables(self.connection)
+        return list(self.tables)
+
+    def get_columns(self, table: str) -> list:
+        """
+        Get the names and declared types of a table's columns.
+
+        :param table: The name of the table.
+        :return: A list of dictionaries with the column name and type.
+        """
+        self.refresh()
+        if table not in self.columns:
+            cursor = self.connection.execute(f"PRAGMA table_info({quote_identifier(table)})")
+            self.columns[table] = [{"name": col[1], "type": col[2]} for col in cursor.fetchall()]
+        return [dict(column) for column in self.columns[table]]
+
+    def get_row_count(self, table: str) -> int:
+        """
+        Get the number of rows in a table.
+
+        :param table: The name of the table.
+        :return: The row count.
+        """
+        self.refresh()
+        if table not in self.row_counts:
+            cursor = self.connection.execute(f"SELECT count(*) FROM {quote_identifier(table)}")
+            self.row_counts[table] = cursor.fetchone()[0]
+        return self.row_counts[table]
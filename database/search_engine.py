@@ -0,0 +1,276 @@
+import os
+import sqlite3
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Callable, Iterator, NamedTuple
+from database.connection import open_read_only
+from database.sql_utils import quote_identifier
+from database.schema_cache import SchemaCache
+from database.search_index import SearchIndex, MIN_QUERY_LENGTH
+
+
+# SQLite releases the GIL while it scans, so searching tables on threads runs in parallel.
+# Global search spreads whole database files over worker processes instead.
+MAX_SEARCH_WORKERS = min(8, os.cpu_count() or 1)
+
+# SQLite's lower() only folds ASCII letters, so a search for a string with other letters
+# compares cells lowercased by Python instead, through this function
+PYTHON_LOWER_FUNCTION = "python_lower"
+
+
+def python_lower(value):
+    return None if value is None else str(value).lower()
+
+
+class SearchHit(NamedTuple):
+    """
+    A single cell that matched a search query.
+    """
+    table: str
+    rowid: int
+    column: str
+    type: str
+    value: object
+    database: str = None
+
+
+class SearchEngine:
+    def __init__(self, connection: sqlite3.Connection, schema_cache: SchemaCache = None):
+        """
+        Initialize the search engine.
+
+        :param connection: Connection to the database to search.
+        :param schema_cache: The connection's schema cache, if it already has one.
+        """
+        self.connection = connection
+        self.schema_cache = schema_cache or SchemaCache(connection)
+        self.search_index = SearchIndex(connection)
+        connection.create_function(PYTHON_LOWER_FUNCTION, 1, python_lower, deterministic=True)
+
+    def get_columns(self, table: str) -> list:
+        """
+        Get the column names and declared types for a table.
+
+        :param table: The name of the table.
+        :return: A list of dictionaries with the column name and type.
+        """
+        return self.schema_cache.get_columns(table)
+
+    @staticmethod
+    def build_query(table: str, columns: list, index: str = None, lower: str = "lower") -> str:
+        """
+        Build a parameterized query that lets SQLite find the rows containing the search string.
+
+        The query selects the rowid, one match flag per column and the column values. The
+        lowercased search string is bound once as parameter ?1. When an FTS5 index is given,
+        candidate rows come from the index instead of a table scan and the FTS5 phrase query
+        is bound as parameter ?2.
+
+        :param table: The name of the table to search.
+        :param columns: The columns of the table, as returned by get_columns.
+        :param index: The name of the table's FTS5 search index, if it should be used.
+        :param lower: The SQL function that lowercases the cells.
+        :return: The SQL query.
+        """
+        conditions = [f"instr({lower}({quote_identifier(col['name'])}), ?1) > 0" for col in columns]
+        values = [quote_identifier(col["name"]) for col in columns]
+        if index:
+            where = f"rowid IN (SELECT rowid FROM {quote_identifier(index)} WHERE {quote_identifier(index)} MATCH ?2)"
+        else:
+            where = " OR ".join(conditions)
+        return (
+            f"SELECT rowid, {', '.join(conditions)}, {', '.join(values)} "
+            f"FROM {quote_identifier(table)} "
+            f"WHERE {where}"
+        )
+
+    def search_table(self, table: str, search_string: str, columns: list = None) -> Iterator[SearchHit]:
+        """
+        Search a single table, yielding one hit per matching cell.
+
+        Rows are read from the cursor as they are consumed, so a caller that stops early
+        never pays for the rest of the table.
+
+        :param table: The name of the table to search.
+        :param search_string: The string to look for (case-insensitive).
+        :param columns: The table's columns, if the caller already looked them up.
+        """
+        if columns is None:
+            columns = self.get_columns(table)
+        if not columns:
+            return
+
+        # The built-in lower() is much faster. It leaves letters outside ASCII as they are,
+        # which only matters when the search string has such letters.
+        lower = "lower" if search_string.isascii() else PYTHON_LOWER_FUNCTION
+        if len(search_string) >= MIN_QUERY_LENGTH and self.search_index.exists(table):
+            query = self.build_query(table, columns, self.search_index.index_name(table), lower)
+            parameters = (search_string.lower(), SearchIndex.build_match_query(search_string))
+        else:
+            query = self.build_query(table, columns, lower=lower)
+            parameters = (search_string.lower(),)
+
+        cursor = self.connection.execute(query, parameters)
+        column_count = len(columns)
+        for row in cursor:
+            rowid = row[0]
+            flags = row[1:column_count + 1]
+            values = row[column_count + 1:]
+            for column, matched, value in zip(columns, flags, values):
+                if matched:
+                    yield SearchHit(table, rowid, column["name"], column["type"], value)
+
+    def search(self, tables: list, search_string: str) -> Iterator[SearchHit]:
+        """
+        Search several tables one after another.
+
+        The hits are generated lazily; wrap the result in itertools.islice to cap it.
+
+        :param tables: The names of the tables to search.
+        :param search_string: The string to look for (case-insensitive).
+        """
+        for table in tables:
+            yield from self.search_table(table, search_string)
+
+
+def search_table_file(db_path: str, table: str, search_string: str, limit: int, profile: dict = None,
+                      columns: list = None) -> list:
+    """
+    Search one table on a private read-only connection.
+
+    :param db_path: Path to the database file.
+    :param table: The name of the table to search.
+    :param search_string: The string to look for (case-insensitive).
+    :param limit: The maximum number of hits to return.
+    :param profile: The connection profile to apply.
+    :param columns: The table's columns, if the caller already looked them up.
+    :return: The list of hits, in rowid order.
+    """
+    connection = open_read_only(db_path, profile)
+    try:
+        return list(islice(SearchEngine(connection).search_table(table, search_string, columns), limit))
+    finally:
+        connection.close()
+
+
+def search_database_file(db_path: str, search_string: str, limit: int, profile: dict = None) -> list:
+    """
+    Search every user table of a database file on a private read-only connection.
+
+    Runs in a worker process during a global search.
+
+    :param db_path: Path to the database file.
+    :param search_string: The string to look for (case-insensitive).
+    :param limit: The maximum number of hits to return.
+    :param profile: The connection profile to apply.
+    :return: The list of hits, labeled with the database file name.
+    """
+    database = os.path.basename(db_path)
+    connection = open_read_only(db_path, profile)
+    try:
+        search_engine = SearchEngine(connection)
+        hits = islice(search_engine.search(search_engine.schema_cache.get_tables(), search_string), limit)
+        return [hit._replace(database=database) for hit in hits]
+    finally:
+        connection.close()
+
+
+def iter_results_in_order(executor: Executor, function: Callable, items: list, *args,
+                          on_item_done: Callable[[str, int], None] = None,
+                          skip_errors: tuple = (),
+                          on_item_skipped: Callable[[str, Exception], None] = None) -> Iterator[SearchHit]:
+    """
+    Run function(item, *args) for every item on an executor and yield the hits in item order.
+
+    Hits are yielded in the order of the items list no matter which worker finishes
+    first, so results are deterministic. Items that have not started yet are cancelled
+    when the caller stops reading.
+
+    :param executor: The thread or process pool to run the searches on.
+    :param function: The search function; it must return a list of hits.
+    :param items: The first argument for each call, such as table names or database paths.
+    :param args: The remaining arguments, shared by every call.
+    :param on_item_done: Called with the item and its hit count as each item finishes.
+    :param skip_errors: Exception types that skip the item they are raised for, instead of
+        ending the whole search.
+    :param on_item_skipped: Called with the item and the error as each item is skipped.
+    """
+    def report(item, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            if on_item_done:
+                on_item_done(item, len(future.result()))
+        elif isinstance(error, skip_errors) and on_item_skipped:
+            on_item_skipped(item, error)
+
+    with executor:
+        futures = []
+        try:
+            for item in items:
+                future = executor.submit(function, item, *args)
+                if on_item_done or on_item_skipped:
+                    future.add_done_callback(partial(report, item))
+                futures.append(future)
+
+            for future in futures:
+                try:
+                    hits = future.result()
+                except skip_errors:
+                    continue
+                yield from hits
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def search_tables_parallel(db_path: str, tables: list, search_string: str, limit: int,
+                           on_table_done: Callable[[str, int], None] = None,
+                           profile: dict = None, columns: dict = None) -> Iterator[SearchHit]:
+    """
+    Search several tables of one database at once on a thread pool.
+
+    Every worker opens its own read-only connection.
+
+    :param db_path: Path to the database file.
+    :param tables: The names of the tables to search.
+    :param search_string: The string to look for (case-insensitive).
+    :param limit: The maximum number of hits to collect from each table.
+    :param on_table_done: Called with the table name and hit count as each table finishes.
+    :param profile: The connection profile to apply to each worker's connection.
+    :param columns: Mapping of table name to its columns, so workers skip the introspection.
+    """
+    columns = columns or {}
+
+    def search(table, *args):
+        return search_table_file(db_path, table, *args, columns=columns.get(table))
+
+    executor = ThreadPoolExecutor(max_workers=min(MAX_SEARCH_WORKERS, len(tables)) or 1)
+    yield from iter_results_in_order(executor, search, tables, search_string, limit, profile,
+                                     on_item_done=on_table_done)
+
+
+def search_databases_parallel(db_paths: list, search_string: str, limit: int,
+                              on_database_done: Callable[[str, int], None] = None,
+                              profile: dict = None,
+                              on_database_skipped: Callable[[str, Exception], None] = None) -> Iterator[SearchHit]:
+    """
+    Search every table of several database files at once on a process pool.
+
+    Every worker process opens the database it is given read-only. A file that SQLite
+    cannot read, such as one that is not a database, is skipped and the others are still
+    searched.
+
+    :param db_paths: Paths to the database files.
+    :param search_string: The string to look for (case-insensitive).
+    :param limit: The maximum number of hits to collect from each database.
+    :param on_database_done: Called with the database path and hit count as each database finishes.
+    :param profile: The connection profile to apply to each worker's connection.
+    :param on_database_skipped: Called with the database path and the error for each skipped file.
+    """
+    executor = ProcessPoolExecutor(max_workers=min(MAX_SEARCH_WORKERS, len(db_paths)) or 1)
+    yield from iter_results_in_order(executor, search_database_file, db_paths, search_string, limit, profile,
+                                     on_item_done=on_database_done, skip_errors=(sqlite3.DatabaseError,),
+                                     on_item_skipped=on_database_skipped)
@@ -0,0 +1,134 @@
+import sqlite3
+from database.sql_utils import quote_identifier, quote_literal, INTERNAL_TABLE_PREFIX
+
+
+INDEX_PREFIX = INTERNAL_TABLE_PREFIX + "fts_"
+
+# The trigram tokenizer cannot match strings shorter than this
+MIN_QUERY_LENGTH = 3
+
+
+class SearchIndex:
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        Manage the FTS5 shadow indexes used to speed up database search.
+
+        Each index is an external-content FTS5 table using the trigram tokenizer, so it
+        answers the same case-insensitive substring queries as a full scan. Triggers on the
+        user table keep the index up to date on every insert, update and delete.
+
+        :param connection: Connection to the database that holds the indexed tables.
+        """
+        self.connection = connection
+
+    @staticmethod
+    def index_name(table: str) -> str:
+        """
+        Get the name of the FTS5 table that indexes a user table.
+
+        The suffix keeps index names from colliding with the shadow tables FTS5 creates
+        for the index of another table.
+        """
+        return f"{INDEX_PREFIX}{table}__idx"
+
+    def exists(self, table: str) -> bool:
+        """
+        Check if a user table has a search index.
+        """
+        row = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (self.index_name(table),)
+        ).fetchone()
+        return row is not None
+
+    def get_table_columns(self, table: str) -> list:
+        """
+        Get the column names of a table, in order.
+        """
+        return [col[1] for col in self.connection.execute(f"PRAGMA table_info({quote_identifier(table)})")]
+
+    def is_current(self, table: str) -> bool:
+        """
+        Check if an existing index still covers the same columns as its table.
+        """
+        return self.get_table_columns(self.index_name(table)) == self.get_table_columns(table)
+
+    def build(self, table: str) -> None:
+        """
+        Create (or recreate) the search index for a table and fill it from the table's rows.
+
+        :param table: The name of the user table to index.
+        """
+        columns = self.get_table_columns(table)
+        if not columns:
+            raise sqlite3.OperationalError(f"no such table: {table}")
+
+        index = quote_identifier(self.index_name(table))
+        quoted_columns = [quote_identifier(column) for column in columns]
+
+        with self.connection:
+            self.drop_objects(table)
+            self.connection.execute(
+                f"CREATE VIRTUAL TABLE {index} USING fts5({', '.join(quoted_columns)}, "
+                f"content={quote_literal(table)}, content_rowid='rowid', tokenize='trigram')"
+            )
+            self.connection.execute(f"INSERT INTO {index}({index}) VALUES ('rebuild')")
+
+            # Keep the index in step with the table
+            new_values = ", ".join(f"new.{column}" for column in quoted_columns)
+            old_values = ", ".join(f"old.{column}" for column in quoted_columns)
+            column_list = ", ".join(quoted_columns)
+            triggers = {
+                "ai": f"AFTER INSERT ON {quote_identifier(table)} BEGIN "
+                      f"INSERT INTO {index}(rowid, {column_list}) VALUES (new.rowid, {new_values}); END",
+                "ad": f"AFTER DELETE ON {quote_identifier(table)} BEGIN "
+                      f"INSERT INTO {index}({index}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); END",
+                "au": f"AFTER UPDATE ON {quote_identifier(table)} BEGIN "
+                      f"INSERT INTO {index}({index}, rowid, {column_list}) VALUES ('delete', old.rowid, {old_values}); "
+                      f"INSERT INTO {index}(rowid, {column_list}) VALUES (new.rowid, {new_values}); END",
+            }
+            for suffix, body in triggers.items():
+                self.connection.execute(f"CREATE TRIGGER {quote_identifier(self.trigger_name(table, suffix))} {body}")
+
+    def drop(self, table: str) -> None:
+        """
+        Remove the search index for a table.
+
+        :param table: The name of the user table.
+        """
+        with self.connection:
+            self.drop_objects(table)
+
+    def drop_objects(self, table: str) -> None:
+        """
+        Drop the index table and its triggers without committing.
+        """
+        for suffix in ("ai", "ad", "au"):
+            self.connection.execute(f"DROP TRIGGER IF EXISTS {quote_identifier(self.trigger_name(table, suffix))}")
+        self.connection.execute(f"DROP TABLE IF EXISTS {quote_identifier(self.index_name(table))}")
+
+    def sync(self, table: str) -> None:
+        """
+        Make sure an existing index matches its table, rebuilding it if the columns changed.
+
+        Tables without an index are left alone.
+
+        :param table: The name of the user table.
+        """
+        if self.exists(table) and not self.is_current(table):
+            self.build(table)
+
+    def trigger_name(self, table: str, suffix: str) -> str:
+        """
+        Get the name of one of the triggers that maintain an index.
+        """
+        return f"{self.index_name(table)}_{suffix}"
+
+    @staticmethod
+    def build_match_query(search_string: str) -> str:
+        """
+        Turn a search string into an FTS5 phrase query.
+
+        :param search_string: The raw search string.
+        :return: The search string as a quoted FTS5 phrase.
+        """
+        return '"' + search_string.replace('"', '""') + '"'
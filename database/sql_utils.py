@@ -0,0 +1,44 @@
+import sqlite3
+
+
+# Every table created by the app for its own bookkeeping starts with this prefix
+INTERNAL_TABLE_PREFIX = "__ttb_"
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Quote a table or column name for use in an SQL statement.
+
+    :param name: The identifier to quote.
+    :return: The identifier wrapped in double quotes with embedded quotes escaped.
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def quote_literal(value: str) -> str:
+    """
+    Quote a value as an SQL string literal.
+
+    :param value: The value to quote.
+    :return: The value wrapped in single quotes with embedded quotes escaped.
+    """
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def list_user_tables(connection: sqlite3.Connection) -> list:
+    """
+    Get the names of the user tables in a database.
+
+    SQLite's own tables and the tables the app creates for its bookkeeping, such as
+    search indexes, are left out.
+
+    :param connection: Connection to the database.
+    :return: The list of table names.
+    """
+    cursor = connection.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' "
+        "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' "
+        "AND substr(name, 1, ?) != ?",
+        (len(INTERNAL_TABLE_PREFIX), INTERNAL_TABLE_PREFIX)
+    )
+    return [row[0] for row in cursor.fetchall()]
@@ -92,7 +92,9 @@ class MessagePanel:
 - [bold cyan]add row[/]: Add a row to the table.
 - [bold cyan]remove column[/]: Removes a column from the table.
 - [bold cyan]remove row[/]: Removes a row from the table.
-- [bold cyan]edit cell[/]: Allows you to edit the content of a cell in the table.
+- [bold cyan]edit cell[/]: Allows you to edit the content of a cell in the table, picked as 'row,column' (by column number or name), with row ranges and 'find <text>' to locate it.
+- [bold cyan]filter rows[/]: Show the rows where a column equals a value.
+- [bold cyan]count values[/]: Count how many rows hold each value of a column.
 - [bold cyan]print table[/]: Prints the table to the screen.
 - [bold cyan]rename[/]: Renames the table.
 - [bold cyan]print table data[/]: Prints the JSON data for the table.
@@ -102,11 +104,18 @@ class MessagePanel:
 - [bold cyan]save table[/]: Save the table to the database.
 - [bold cyan]print table data[/]: Print the JSON data for the current table.
 - [bold cyan]load csv[/]: Loads a CSV file into a formatted table.
+- [bold cyan]import csv[/]: Stream a CSV file straight into a database table without loading it into memory.
+- [bold cyan]load ndjson[/]: Load a table from a line-delimited JSON file saved with save ndjson.
+- [bold cyan]save snapshot[/]: Save the table to a snapshot file that opens instantly.
+- [bold cyan]load snapshot[/]: Open a table from a snapshot file.
 - [bold cyan]load csv batch[/]: Load a bunch of CSV files automatically from a directory into the database.
 - [bold cyan]list tables[/]: List the available tables from the database.
-- [bold cyan]save csv[/]: Save the data from the table to a CSV file.
+- [bold cyan]save csv[/]: Save the data from the table to a CSV file, optionally gzip compressed.
+- [bold cyan]export csv[/]: Export a table from the database straight to a CSV file without loading it.
+- [bold cyan]export all[/]: Save the table as CSV, NDJSON and PDF files in one pass.
 - [bold cyan]save pdf[/]: Save the table to a PDF file.
 - [bold cyan]save json[/]: Save the table data to a JSON file.
+- [bold cyan]save ndjson[/]: Save the table data to a line-delimited JSON file, optionally gzip compressed.
 - [bold cyan]exit[/]: Go back to the main menu.
 - [bold cyan]print help[/]: Prints this screen.
         """
@@ -144,6 +153,9 @@ class MessagePanel:
 - [bold cyan]select database:[/] Choose a database from a list of available databases.
 - [bold cyan]current database:[/] Show the currently connected database.
 - [bold cyan]search:[/] Search through the current database based on a query. Returns information on the table, type, and position.
+- [bold cyan]global search:[/] Search every database in the 'databases' directory at once. No database needs to be selected.
+- [bold cyan]build index:[/] Build a full-text search index for a table to make searching it much faster.
+- [bold cyan]drop index:[/] Remove the full-text search index from a table.
 - [bold cyan]help:[/] Print this instruction screen.
 - [bold cyan]exit:[/] Return to the main menu.
 [/green]
@@ -3,6 +3,8 @@ from rich.table import Table
 import json
 from autocomplete.autocomplete import Autocomplete
 from rich.console import Console
+from database.connection import CONNECTION_PROFILES, DEFAULT_CONNECTION_PROFILE
+from table_builder.plain_renderer import TABLE_RENDERERS
 
 
 class Settings:
@@ -38,6 +40,60 @@ class Settings:
                 self.set_hide_instructions(value)
                 self.save_settings()
 
+            elif setting == "infer_csv_types":
+                value = self.console.input("[bold yellow]Turn CSV type inference on or off[/]: ").lower().strip()
+                self.set_infer_csv_types(value)
+                self.save_settings()
+
+            elif setting == "search_result_limit":
+                value = self.console.input("[bold yellow]Enter the maximum number of search results[/]: ").strip()
+                self.set_search_result_limit(value)
+                self.save_settings()
+
+            elif setting == "search_page_size":
+                value = self.console.input("[bold yellow]Enter the number of search results per page[/]: ").strip()
+                self.set_search_page_size(value)
+                self.save_settings()
+
+            elif setting == "save_chunk_size":
+                value = self.console.input("[bold yellow]Enter the number of rows to write per transaction[/]: ").strip()
+                self.set_save_chunk_size(value)
+                self.save_settings()
+
+            elif setting == "lazy_load_threshold":
+                value = self.console.input("[bold yellow]Enter the row count above which tables are loaded lazily[/]: ").strip()
+                self.set_lazy_load_threshold(value)
+                self.save_settings()
+
+            elif setting == "table_page_size":
+                value = self.console.input("[bold yellow]Enter the number of rows shown per page of a large table[/]: ").strip()
+                self.set_table_page_size(value)
+                self.save_settings()
+
+            elif setting == "paged_view_threshold":
+                value = self.console.input("[bold yellow]Enter the row count above which tables are shown a page at a time[/]: ").strip()
+                self.set_paged_view_threshold(value)
+                self.save_settings()
+
+            elif setting == "table_renderer":
+                value = self.console.input(
+                    f"[bold yellow]Enter a table renderer ({', '.join(TABLE_RENDERERS)})[/]: "
+                ).lower().strip()
+                self.set_table_renderer(value)
+                self.save_settings()
+
+            elif setting == "plain_render_threshold":
+                value = self.console.input("[bold yellow]Enter the row count above which tables are drawn as plain text[/]: ").strip()
+                self.set_plain_render_threshold(value)
+                self.save_settings()
+
+            elif setting == "connection_profile":
+                value = self.console.input(
+                    f"[bold yellow]Enter a connection profile ({', '.join(CONNECTION_PROFILES)})[/]: "
+                ).lower().strip()
+                self.set_connection_profile(value)
+                self.save_settings()
+
             elif setting == "print settings":
                 self.print_settings()
                 
@@ -55,7 +111,17 @@ class Settings:
         except (FileNotFoundError, json.JSONDecodeError):
             # Default settings if file is missing or corrupted
             return {"autoprint_table": False,
-                    "hide_instructions": False}
+                    "hide_instructions": False,
+                    "infer_csv_types": True,
+                    "search_result_limit": 1000,
+                    "search_page_size": 20,
+                    "save_chunk_size": 10000,
+                    "lazy_load_threshold": 100000,
+                    "table_page_size": 50,
+                    "paged_view_threshold": 500,
+                    "table_renderer": "auto",
+                    "plain_render_threshold": 2000,
+                    "connection_profile": dict(CONNECTION_PROFILES[DEFAULT_CONNECTION_PROFILE])}
         
     def save_settings(self):
         with open(self.settings_file, 'w') as f:
@@ -70,14 +136,34 @@ class Settings:
         # Dynamically add rows from settings dictionary
         for setting, value in self.settings.items():
             description = self.get_setting_description(setting)
-            table.add_row(setting, description, "on" if value else "off")
+            table.add_row(setting, description, self.format_setting_value(value))
         
         self.console.print(table)
         
+    @staticmethod
+    def format_setting_value(value) -> str:
+        if isinstance(value, bool):
+            return "on" if value else "off"
+        if isinstance(value, dict):
+            return "\n".join(f"{key} = {item}" for key, item in value.items())
+        return str(value)
+
     def get_setting_description(self, setting: str) -> str:
         descriptions = {
             "autoprint_table": "Automatically prints the table after a change has been made.",
-            "hide_instructions": "Hide the instructions message when using the app."
+            "hide_instructions": "Hide the instructions message when using the app.",
+            "infer_csv_types": "Detect int, float and bool columns when loading or importing a CSV file.",
+            "search_result_limit": "Stop searching after this many matches.",
+            "search_page_size": "Number of search results shown per page.",
+            "save_chunk_size": "Number of rows written per transaction when saving a table to the database.",
+            "lazy_load_threshold": "Tables with more rows than this are read from the database a page at a time when loaded.",
+            "table_page_size": "Number of rows shown per page when a table is shown a page at a time.",
+            "paged_view_threshold": "Tables with more rows than this are shown a page at a time by 'print table'.",
+            "table_renderer": "How tables are drawn: 'rich' with borders and styles, 'plain' as fixed-width text, "
+                              "or 'auto' to switch to plain text for tables larger than plain_render_threshold.",
+            "plain_render_threshold": "With the 'auto' table renderer, tables with more rows than this are drawn as plain text.",
+            "connection_profile": "SQLite pragmas set on every database connection. "
+                                  "'safe' syncs every commit to disk; 'bulk load' trades durability for speed."
         }
         return descriptions.get(setting, "No description available.")
     
@@ -111,3 +197,121 @@ class Settings:
             self.message_panel.create_information_message("hide_instructions [bold red]off[/]")
         else:
             self.message_panel.create_error_message("Enter 'on' or 'off'.")
+
+    def get_infer_csv_types(self) -> str:
+        value = self.settings.get("infer_csv_types", True)
+        return "on" if value else "off"
+
+    def set_infer_csv_types(self, value: str):
+        value = value.lower().strip()
+        if value == "on":
+            self.settings["infer_csv_types"] = True
+            self.message_panel.create_information_message("infer_csv_types [bold green]on[/]")
+        elif value == "off":
+            self.settings["infer_csv_types"] = False
+            self.message_panel.create_information_message("infer_csv_types [bold red]off[/]")
+        else:
+            self.message_panel.create_error_message("Enter 'on' or 'off'.")
+
+    def get_search_result_limit(self) -> int:
+        return self.settings.get("search_result_limit", 1000)
+
+    def set_search_result_limit(self, value: str):
+        limit = self.parse_positive_int(value)
+        if limit is not None:
+            self.settings["search_result_limit"] = limit
+            self.message_panel.create_information_message(f"search_result_limit [bold green]{limit}[/]")
+
+    def get_search_page_size(self) -> int:
+        return self.settings.get("search_page_size", 20)
+
+    def set_search_page_size(self, value: str):
+        page_size = self.parse_positive_int(value)
+        if page_size is not None:
+            self.settings["search_page_size"] = page_size
+            self.message_panel.create_information_message(f"search_page_size [bold green]{page_size}[/]")
+
+    def parse_positive_int(self, value: str):
+        """
+        Parse a setting value that must be a whole number greater than zero.
+
+        :param value: The value entered by the user.
+        :return: The parsed number, or None if the value is invalid.
+        """
+        try:
+            number = int(value)
+        except ValueError:
+            number = 0
+        if number < 1:
+            self.message_panel.create_error_message("Enter a whole number greater than 0.")
+            return None
+        return number
+
+    def get_save_chunk_size(self) -> int:
+        return self.settings.get("save_chunk_size", 10000)
+
+    def set_save_chunk_size(self, value: str):
+        chunk_size = self.parse_positive_int(value)
+        if chunk_size is not None:
+            self.settings["save_chunk_size"] = chunk_size
+            self.message_panel.create_information_message(f"save_chunk_size [bold green]{chunk_size}[/]")
+
+    def get_lazy_load_threshold(self) -> int:
+        return self.settings.get("lazy_load_threshold", 100000)
+
+    def set_lazy_load_threshold(self, value: str):
+        threshold = self.parse_positive_int(value)
+        if threshold is not None:
+            self.settings["lazy_load_threshold"] = threshold
+            self.message_panel.create_information_message(f"lazy_load_threshold [bold green]{threshold}[/]")
+
+    def get_table_page_size(self) -> int:
+        return self.settings.get("table_page_size", 50)
+
+    def set_table_page_size(self, value: str):
+        page_size = self.parse_positive_int(value)
+        if page_size is not None:
+            self.settings["table_page_size"] = page_size
+            self.message_panel.create_information_message(f"table_page_size [bold green]{page_size}[/]")
+
+    def get_paged_view_threshold(self) -> int:
+        return self.settings.get("paged_view_threshold", 500)
+
+    def set_paged_view_threshold(self, value: str):
+        threshold = self.parse_positive_int(value)
+        if threshold is not None:
+            self.settings["paged_view_threshold"] = threshold
+            self.message_panel.create_information_message(f"paged_view_threshold [bold green]{threshold}[/]")
+
+    def get_table_renderer(self) -> str:
+        return self.settings.get("table_renderer", "auto")
+
+    def set_table_renderer(self, value: str):
+        value = value.lower().strip()
+        if value in TABLE_RENDERERS:
+            self.settings["table_renderer"] = value
+            self.message_panel.create_information_message(f"table_renderer [bold green]{value}[/]")
+        else:
+            self.message_panel.create_error_message(f"Enter one of: {', '.join(TABLE_RENDERERS)}.")
+
+    def get_plain_render_threshold(self) -> int:
+        return self.settings.get("plain_render_threshold", 2000)
+
+    def set_plain_render_threshold(self, value: str):
+        threshold = self.parse_positive_int(value)
+        if threshold is not None:
+            self.settings["plain_render_threshold"] = threshold
+            self.message_panel.create_information_message(f"plain_render_threshold [bold green]{threshold}[/]")
+
+    def get_connection_profile(self) -> dict:
+        return self.settings.get("connection_profile", CONNECTION_PROFILES[DEFAULT_CONNECTION_PROFILE])
+
+    def set_connection_profile(self, value: str):
+        value = value.lower().strip()
+        if value in CONNECTION_PROFILES:
+            self.settings["connection_profile"] = dict(CONNECTION_PROFILES[value])
+            self.message_panel.create_information_message(
+                f"connection_profile [bold green]{value}[/]. It applies to the next database connection."
+            )
+        else:
+            self.message_panel.create_error_message(f"Enter one of: {', '.join(CONNECTION_PROFILES)}.")
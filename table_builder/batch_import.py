@@ -0,0 +1,151 @@
+import os
+import queue
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from multiprocessing import Manager
+from typing import Iterator
+from table_builder.csv_import import ColumnTypesChanged, CsvStream, convert_chunks
+from table_builder.type_inference import infer_column_types
+
+
+# CSV parsing is CPU bound, so files are parsed in worker processes. Only the parent
+# process writes to the database, which keeps SQLite to a single writer.
+MAX_IMPORT_WORKERS = min(8, os.cpu_count() or 1)
+
+# How many parsed chunks per worker may wait for the writer before the workers pause
+QUEUED_CHUNKS_PER_WORKER = 2
+
+# How long to wait on the queue before checking whether to give up
+POLL_SECONDS = 0.5
+
+
+def find_csv_files(directory: str, recursive: bool) -> list:
+    """
+    Find the CSV files in a directory.
+
+    :param directory: The directory to look in.
+    :param recursive: Also look in every subdirectory.
+    :return: The paths of the files, sorted.
+    """
+    if recursive:
+        paths = [os.path.join(root, file) for root, _, files in os.walk(directory) for file in files]
+    else:
+        paths = [os.path.join(directory, file) for file in os.listdir(directory)]
+    return sorted(path for path in paths if path.endswith('.csv') and os.path.isfile(path))
+
+
+def send(messages, cancelled, message: tuple) -> None:
+    """
+    Put a message on the queue, waiting while it is full unless the import was cancelled.
+    """
+    while True:
+        if cancelled.is_set():
+            raise InterruptedError("Import cancelled.")
+        try:
+            messages.put(message, timeout=POLL_SECONDS)
+            return
+        except queue.Full:
+            continue
+
+
+def parse_csv_file(file_index: int, path: str, chunk_size: int, infer_types: bool, messages, cancelled) -> None:
+    """
+    Parse one CSV file in a worker process and send it to the writer a chunk at a time.
+
+    The messages sent are, in order:
+        ("columns", file_index, columns)
+        ("rows", file_index, rows, bytes read so far)  for each chunk
+        ("done", file_index, seconds spent parsing)
+    or ("error", file_index, message) as soon as something goes wrong.
+
+    The column types are guessed from the first chunk. If a later chunk holds a value that
+    does not fit its column's type, the worker finds the types that every value of the file
+    fits and starts over: it sends "columns" again with the wider types, and then every
+    row again. The writer drops the rows it was sent before.
+
+    :param file_index: The position of the file in the batch.
+    :param path: Path to the CSV file.
+    :param chunk_size: The number of rows per chunk.
+    :param infer_types: Guess the column types instead of using strings.
+    :param messages: The queue the writer reads from.
+    :param cancelled: Event set by the writer when it stops reading.
+    """
+    start = time.perf_counter()
+    try:
+        column_types = None
+        while True:
+            with CsvStream(path, chunk_size) as stream:
+                if stream.header is None:
+                    raise ValueError("CSV file is empty.")
+
+                chunks = stream.chunks()
+                first_chunk = next(chunks, [])
+                if column_types is None:
+                    if infer_types:
+                        column_types = infer_column_types(first_chunk, len(stream.header))
+                    else:
+                        column_types = ["str"] * len(stream.header)
+                columns = [{"name": col, "type": data_type} for col, data_type in zip(stream.header, column_types)]
+                send(messages, cancelled, ("columns", file_index, columns))
+
+                try:
+                    for rows in convert_chunks(chain([first_chunk], chunks), column_types):
+                        send(messages, cancelled, ("rows", file_index, rows, stream.position()))
+                except ColumnTypesChanged as e:
+                    column_types = e.column_types
+                    continue
+            break
+
+        send(messages, cancelled, ("done", file_index, time.perf_counter() - start))
+    except InterruptedError:
+        pass
+    except UnicodeDecodeError:
+        send(messages, cancelled, ("error", file_index, "Failed to decode file. Ensure it is UTF-8 encoded."))
+    except Exception as e:
+        send(messages, cancelled, ("error", file_index, str(e)))
+
+
+def parse_csv_files_parallel(paths: list, chunk_size: int, infer_types: bool,
+                             workers: int = MAX_IMPORT_WORKERS) -> Iterator[tuple]:
+    """
+    Parse several CSV files at once on a process pool and yield their messages as they arrive.
+
+    See parse_csv_file for the messages. Chunks of different files are interleaved, but
+    the chunks of one file arrive in order. The queue between the workers and the caller
+    is bounded, so the workers wait when the caller falls behind. Workers stop as soon as
+    the caller stops reading.
+
+    :param paths: The CSV files to parse.
+    :param chunk_size: The number of rows per chunk.
+    :param infer_types: Guess the column types of each file instead of using strings.
+    :param workers: The number of worker processes.
+    """
+    workers = max(1, min(workers, len(paths)))
+    with Manager() as manager:
+        messages = manager.Queue(maxsize=workers * QUEUED_CHUNKS_PER_WORKER)
+        cancelled = manager.Event()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(parse_csv_file, index, path, chunk_size, infer_types, messages, cancelled)
+                for index, path in enumerate(paths)
+            ]
+            finished = 0
+            try:
+                while finished < len(paths):
+                    try:
+                        message = messages.get(timeout=POLL_SECONDS)
+                    except queue.Empty:
+                        # A worker that died without reporting would leave us waiting forever
+                        if all(future.done() for future in futures) and messages.empty():
+                            for future in futures:
+                                future.result()
+                            raise RuntimeError("A CSV worker stopped without finishing its file.")
+                        continue
+                    if message[0] in ("done", "error"):
+                        finished += 1
+                    yield message
+            finally:
+                cancelled.set()
+                for future in futures:
+                    future.cancel()
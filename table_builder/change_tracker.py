@@ -0,0 +1,83 @@
+class Row(dict):
+    """
+    A table row that remembers the SQLite rowid it is stored under, if any.
+    """
+    __slots__ = ("rowid",)
+
+    def __init__(self, *args, rowid: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rowid = rowid
+
+
+class ChangeTracker:
+    def __init__(self):
+        """
+        Track which rows were edited, added or removed since the table was last saved.
+
+        Edited rows are kept by rowid, holding their values after the edit, and removed rows
+        by rowid alone. Added rows are the rows that have no rowid yet, so only their number
+        is tracked here; the rows themselves are found in the table when it is saved.
+
+        The tracked changes only make sense against the database table the rowids came
+        from. That table is recorded as the source: the database path, the table name and
+        the column definitions, along with the number of rows it held. If any of them differ
+        at save time, the table has to be written out in full.
+        """
+        self.source = None
+        self.stored_rows = None
+        self.updated = {}
+        self.inserted = 0
+        self.deleted = set()
+
+    def reset(self, source: tuple = None, stored_rows: int = None) -> None:
+        """
+        Forget all changes and record the table the rows are now in step with.
+
+        :param source: The (database path, table name, column definitions) the rowids belong
+            to, or None if the rows are not stored anywhere yet.
+        :param stored_rows: The number of rows in that table.
+        """
+        self.source = source
+        self.stored_rows = stored_rows if source is not None else None
+        self.updated = {}
+        self.inserted = 0
+        self.deleted = set()
+
+    def can_save_incrementally(self, source: tuple, stored_rows: int) -> bool:
+        """
+        Check if only the tracked changes need to be written to reach a saved table.
+
+        :param source: The (database path, table name, column definitions) being saved to.
+        :param stored_rows: The number of rows that table holds now. A different count than
+            was recorded means the table was changed behind the tracker's back.
+        """
+        return self.source is not None and self.source == source and self.stored_rows == stored_rows
+
+    def has_changes(self) -> bool:
+        return bool(self.updated or self.inserted or self.deleted)
+
+    def mark_updated(self, row: Row) -> None:
+        """
+        Record that a cell in a row was edited.
+
+        :param row: The row with the edit applied.
+        """
+        # Rows that are not stored yet are written in full when inserted
+        if row.rowid is not None:
+            self.updated[row.rowid] = row
+
+    def mark_inserted(self, row: Row) -> None:
+        """
+        Record that a row was added.
+        """
+        self.inserted += 1
+
+    def mark_deleted(self, row: Row) -> None:
+        """
+        Record that a row was removed.
+        """
+        if row.rowid is None:
+            self.inserted -= 1
+        else:
+            self.updated.pop(row.rowid, None)
+            self.deleted.add(row.rowid)
@@ -0,0 +1,702 @@
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+from itertools import compress, repeat
+from operator import eq
+from table_builder.change_tracker import Row
+
+
+class Bitmap:
+    def __init__(self, size: int = 0, fill: bool = False):
+        """
+        A growable list of bits, packed eight to a byte.
+
+        Bits past the end of the list are always zero, so the set bits can be counted and
+        found a byte at a time.
+
+        :param size: The number of bits to start with.
+        :param fill: The value of the starting bits.
+        """
+        self.size = size
+        self.bits = bytearray(b"\xff" if fill else b"\x00") * ((size + 7) // 8)
+        if fill and size % 8:
+            self.bits[-1] = (1 << (size % 8)) - 1
+
+    @classmethod
+    def from_bits(cls, bits, size: int) -> "Bitmap":
+        """
+        Wrap existing packed bits, such as a read-only view of a mapped file.
+        """
+        bitmap = cls()
+        bitmap.bits = bits
+        bitmap.size = size
+        return bitmap
+
+    def writable(self) -> "Bitmap":
+        """
+        Get a bitmap that can be changed: this one, or a copy if its bits are read-only.
+        """
+        if isinstance(self.bits, bytearray):
+            return self
+        return Bitmap.from_bits(bytearray(self.bits), self.size)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> bool:
+        return (self.bits[index >> 3] >> (index & 7)) & 1 == 1
+
+    def __setitem__(self, index: int, bit: bool) -> None:
+        if bit:
+            self.bits[index >> 3] |= 1 << (index & 7)
+        else:
+            self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xff
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield (self.bits[index >> 3] >> (index & 7)) & 1 == 1
+
+    def append(self, bit: bool) -> None:
+        if self.size % 8 == 0:
+            self.bits.append(0)
+        self.size += 1
+        if bit:
+            self[self.size - 1] = True
+
+    def pop(self, index: int) -> bool:
+        """
+        Remove a bit, moving every later bit down by one.
+        """
+        bit = self[index]
+        # Shifting the whole bitmap as one integer is far faster than moving bits one by one
+        number = int.from_bytes(self.bits, "little")
+        number = (number & ((1 << index) - 1)) | ((number >> (index + 1)) << index)
+        self.size -= 1
+        self.bits = bytearray(number.to_bytes((self.size + 7) // 8, "little"))
+        return bit
+
+    def count(self) -> int:
+        return int.from_bytes(self.bits, "little").bit_count()
+
+    def set_positions(self):
+        """
+        Yield the positions of the set bits, skipping empty bytes.
+        """
+        for byte_index, byte in enumerate(self.bits):
+            if byte:
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield byte_index * 8 + bit
+
+
+class NullableColumn:
+    """
+    A column of one type kept in a compact container, with a bitmap marking its empty (None) cells.
+
+    Subclasses choose the container. Storing a value the container cannot hold raises
+    TypeError or OverflowError. The container and bitmap may also be read-only views, such
+    as those of a mapped snapshot; writable() copies them before the column is changed.
+    """
+
+    def __init__(self, values: list = ()):
+        self.values = self.new_container()
+        self.nulls = Bitmap()
+        self.null_count = 0
+        for value in values:
+            self.append(value)
+
+    @staticmethod
+    def new_container():
+        raise NotImplementedError
+
+    def check(self, value):
+        """
+        Get the value to store for a cell, raising TypeError if the column cannot hold it.
+        """
+        return value
+
+    def writable(self):
+        """
+        Get a column that can be changed, copying read-only containers into memory.
+        """
+        self.values = self.writable_container(self.values)
+        self.nulls = self.nulls.writable()
+        return self
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int):
+        if self.null_count and self.nulls[index]:
+            return None
+        return self.values[index]
+
+    def __setitem__(self, index: int, value) -> None:
+        if value is None:
+            if not self.nulls[index]:
+                self.nulls[index] = True
+                self.null_count += 1
+            return
+        self.values[index] = self.check(value)
+        if self.nulls[index]:
+            self.nulls[index] = False
+            self.null_count -= 1
+
+    def __iter__(self):
+        if not self.null_count:
+            return iter(self.values)
+        return (None if null else value for value, null in zip(self.values, self.nulls))
+
+    def append(self, value) -> None:
+        if value is None:
+            self.values.append(self.check(self.empty_value))
+            self.nulls.append(True)
+            self.null_count += 1
+        else:
+            self.values.append(self.check(value))
+            self.nulls.append(False)
+
+    def pop(self, index: int):
+        value = self[index]
+        self.values.pop(index)
+        if self.nulls.pop(index):
+            self.null_count -= 1
+        return value
+
+    def find(self, value) -> list:
+        return [index for index, cell in enumerate(self) if cell == value]
+
+    def count_values(self) -> Counter:
+        return Counter(self)
+
+    @classmethod
+    def of_nulls(cls, size: int):
+        """
+        Create a column of empty cells.
+        """
+        column = cls()
+        column.values = cls.filled_container(size)
+        column.nulls = Bitmap(size, fill=True)
+        column.null_count = size
+        return column
+
+    def nbytes(self) -> int:
+        return len(self.values) * self.values.itemsize + len(self.nulls.bits)
+
+
+class ArrayColumn(NullableColumn):
+    typecode = None
+    empty_value = 0
+
+    @classmethod
+    def new_container(cls):
+        return array(cls.typecode)
+
+    @classmethod
+    def filled_container(cls, size: int):
+        return array(cls.typecode, bytes(array(cls.typecode).itemsize * size))
+
+    @classmethod
+    def writable_container(cls, values):
+        if isinstance(values, memoryview):
+            return array(cls.typecode, values.tobytes())
+        return values
+
+    @classmethod
+    def from_values(cls, values: list):
+        """
+        Build a column from a list in one step instead of a value at a time.
+        """
+        column = cls()
+        if any(isinstance(value, bool) for value in values):
+            raise TypeError("bool values do not belong in a numeric column")
+        null_positions = [index for index, value in enumerate(values) if value is None]
+        if null_positions:
+            values = [cls.empty_value if value is None else value for value in values]
+        column.values = array(cls.typecode, values)
+        column.nulls = Bitmap(len(values))
+        for index in null_positions:
+            column.nulls[index] = True
+        column.null_count = len(null_positions)
+        return column
+
+    def check(self, value):
+        if isinstance(value, bool):
+            raise TypeError("bool values do not belong in a numeric column")
+        return value
+
+
+class IntColumn(ArrayColumn):
+    typecode = "q"
+
+
+class FloatColumn(ArrayColumn):
+    typecode = "d"
+
+
+class BoolColumn(NullableColumn):
+    empty_value = False
+
+    @staticmethod
+    def new_container():
+        return Bitmap()
+
+    @staticmethod
+    def filled_container(size: int):
+        return Bitmap(size)
+
+    @staticmethod
+    def writable_container(values: Bitmap) -> Bitmap:
+        return values.writable()
+
+    @classmethod
+    def from_values(cls, values: list):
+        return cls(values)
+
+    def check(self, value):
+        if not isinstance(value, bool):
+            raise TypeError("only bool values belong in a bool column")
+        return value
+
+    def nbytes(self) -> int:
+        return len(self.values.bits) + len(self.nulls.bits)
+
+
+class ListColumn:
+    """
+    A column kept in a plain list, for strings and for values that do not fit a typed column.
+    """
+
+    def __init__(self, values: list = ()):
+        self.values = list(values)
+
+    @classmethod
+    def from_values(cls, values: list):
+        return cls(values)
+
+    @classmethod
+    def of_nulls(cls, size: int):
+        return cls([None] * size)
+
+    def writable(self):
+        return self
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int):
+        return self.values[index]
+
+    def __setitem__(self, index: int, value) -> None:
+        self.values[index] = value
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def append(self, value) -> None:
+        self.values.append(value)
+
+    def pop(self, index: int):
+        return self.values.pop(index)
+
+    def find(self, value) -> list:
+        return list(compress(range(len(self.values)), map(eq, self.values, repeat(value))))
+
+    def count_values(self) -> Counter:
+        return Counter(self.values)
+
+    def nbytes(self) -> int:
+        return len(self.values) * 8
+
+
+class DictionaryColumn:
+    """
+    A column of repeated values kept as a table of distinct values plus a small integer
+    code per cell, for str columns with few distinct values.
+
+    Codes start as one byte each and widen when the value table outgrows them. Values are
+    told apart by type as well, so 1, 1.0 and True, which are equal in Python, keep their
+    own codes.
+    """
+
+    # Code widths, from narrowest to widest, and how many distinct values each can number
+    CODE_TYPES = (("B", 1 << 8), ("H", 1 << 16), ("I", 1 << 32))
+
+    def __init__(self):
+        self.dictionary = []
+        self.codes_by_value = {}
+        self.codes = array("B")
+
+    @staticmethod
+    def key(value):
+        """
+        Get the key a value is looked up by in codes_by_value.
+        """
+        return value if type(value) is str else (type(value), value)
+
+    @classmethod
+    def from_values(cls, values: list, max_distinct: int = None):
+        """
+        Encode a list of values.
+
+        :param values: The values, which must be hashable.
+        :param max_distinct: Give up and return None once there are more distinct values than this.
+        :return: The column, or None if it gave up.
+        """
+        column = cls()
+        codes_by_value = column.codes_by_value
+        codes = []
+        for value in values:
+            # The key, as from key(), built inline as this runs for every cell
+            key = value if type(value) is str else (type(value), value)
+            code = codes_by_value.get(key)
+            if code is None:
+                if max_distinct is not None and len(codes_by_value) >= max_distinct:
+                    return None
+                code = codes_by_value[key] = len(codes_by_value)
+                column.dictionary.append(value)
+            codes.append(code)
+        column.codes = array(column.code_type(len(column.dictionary)), codes)
+        return column
+
+    @classmethod
+    def from_dictionary(cls, dictionary: list, codes):
+        """
+        Build a column from its table of distinct values and its codes, as saved.
+        """
+        column = cls()
+        column.dictionary = dictionary
+        column.codes_by_value = {cls.key(value): code for code, value in enumerate(dictionary)}
+        column.codes = codes
+        return column
+
+    @classmethod
+    def of_nulls(cls, size: int):
+        column = cls()
+        column.dictionary.append(None)
+        column.codes_by_value[cls.key(None)] = 0
+        column.codes = array("B", bytes(size))
+        return column
+
+    def writable(self):
+        """
+        Get a column that can be changed, copying read-only codes into memory.
+        """
+        if isinstance(self.codes, memoryview):
+            self.codes = array(self.codes.format, self.codes.tobytes())
+        return self
+
+    @classmethod
+    def code_type(cls, distinct: int) -> str:
+        for typecode, limit in cls.CODE_TYPES:
+            if distinct <= limit:
+                return typecode
+        raise OverflowError("too many distinct values for a dictionary column")
+
+    def code_for(self, value) -> int:
+        """
+        Get the code of a value, adding it to the value table if it is new.
+        """
+        key = self.key(value)
+        code = self.codes_by_value.get(key)
+        if code is None:
+            code = self.codes_by_value[key] = len(self.dictionary)
+            self.dictionary.append(value)
+            typecode = self.code_type(len(self.dictionary))
+            if typecode != self.codes.typecode:
+                self.codes = array(typecode, self.codes)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int):
+        return self.dictionary[self.codes[index]]
+
+    def __setitem__(self, index: int, value) -> None:
+        self.codes[index] = self.code_for(value)
+
+    def __iter__(self):
+        return map(self.dictionary.__getitem__, self.codes)
+
+    def append(self, value) -> None:
+        # The codes may be widened while getting the code, so look them up afterwards
+        code = self.code_for(value)
+        self.codes.append(code)
+
+    def pop(self, index: int):
+        return self.dictionary[self.codes.pop(index)]
+
+    def find(self, value) -> list:
+        """
+        Get the indices of the cells equal to a value, comparing codes instead of values.
+        """
+        code = self.codes_by_value.get(self.key(value))
+        if code is None:
+            return []
+        return list(compress(range(len(self.codes)), map(eq, self.codes, repeat(code))))
+
+    def count_values(self) -> Counter:
+        return Counter({self.dictionary[code]: count for code, count in Counter(self.codes).items()})
+
+    def nbytes(self) -> int:
+        return len(self.codes) * self.codes.itemsize + len(self.dictionary) * 8
+
+
+# A str column is dictionary encoded when it has at least this many rows and no more than
+# this share of them are distinct
+DICTIONARY_MIN_ROWS = 1000
+DICTIONARY_MAX_DISTINCT_RATIO = 0.05
+
+
+def make_text_column(values: list):
+    """
+    Build a column for values of any type, dictionary encoding it if it has few distinct values.
+
+    :param values: The values, in row order.
+    :return: A dictionary column or a list column.
+    """
+    if len(values) >= DICTIONARY_MIN_ROWS:
+        try:
+            column = DictionaryColumn.from_values(values, int(len(values) * DICTIONARY_MAX_DISTINCT_RATIO))
+        except TypeError:
+            # Unhashable values cannot be encoded
+            column = None
+        if column is not None:
+            return column
+    return ListColumn(values)
+
+
+COLUMN_CLASSES = {
+    "int": IntColumn,
+    "float": FloatColumn,
+    "bool": BoolColumn,
+    "str": ListColumn,
+}
+
+
+def make_column(data_type: str, values: list):
+    """
+    Build the most compact column that can hold a list of values.
+
+    :param data_type: The column's program type.
+    :param values: The values, in row order.
+    :return: The typed column, or a list column if some value does not fit the type.
+    """
+    column_class = COLUMN_CLASSES.get(data_type, ListColumn)
+    if column_class is ListColumn:
+        return make_text_column(values)
+    try:
+        return column_class.from_values(values)
+    except (TypeError, OverflowError):
+        return make_text_column(values)
+
+
+class ColumnStore(Sequence):
+    def __init__(self, columns: list = (), data: dict = None, rowids: list = None):
+        """
+        An in-memory table kept column by column, instead of as a list of dicts.
+
+        Each column lives in one typed container: an int64 or float64 array for int and
+        float columns, a bitmap for bool columns and a list for str columns, each with a
+        bitmap of empty cells. A str column with few distinct values is dictionary encoded
+        instead. A column that is given a value its container cannot hold, such as text
+        read from an INTEGER column, falls back to a list.
+
+        Indexing returns a Row built from the columns, so changes to it are not stored:
+        edit cells with set_cell. Adding, renaming and removing a column never touches the
+        other columns. The SQLite rowid of every row is kept alongside the data, and rows
+        that have not been saved yet have none.
+
+        :param columns: The columns, with program types.
+        :param data: The values of each column by column name, as lists in row order.
+        :param rowids: The rowid of each row, or None if the rows are not stored anywhere.
+
+        Columns may start out as read-only views, as when opened from a snapshot. Every
+        change goes through writable(), which copies such a column into memory first.
+        """
+        data = data or {}
+        self.length = len(next(iter(data.values()))) if data else len(rowids or ())
+        self.data = {}
+        for column in columns:
+            values = data.get(column["name"])
+            self.data[column["name"]] = make_column(column["type"], values) if values is not None \
+                else COLUMN_CLASSES.get(column["type"], ListColumn).of_nulls(self.length)
+        self.rowids = make_column("int", rowids) if rowids is not None else IntColumn.of_nulls(self.length)
+
+    @classmethod
+    def from_containers(cls, data: dict, rowids, length: int) -> "ColumnStore":
+        """
+        Build a store around columns that are already built, such as those of a snapshot.
+
+        :param data: The column containers by column name, in column order.
+        :param rowids: The int column of rowids.
+        :param length: The number of rows.
+        """
+        store = cls()
+        store.data = dict(data)
+        store.rowids = rowids
+        store.length = length
+        return store
+
+    @classmethod
+    def from_rows(cls, columns: list, rows) -> "ColumnStore":
+        """
+        Build a store from rows, keeping the rowid of each.
+
+        :param columns: The columns, with program types.
+        :param rows: Iterable of Row objects.
+        """
+        names = [column["name"] for column in columns]
+        data = {name: [] for name in names}
+        rowids = []
+        for row in rows:
+            for name in names:
+                data[name].append(row.get(name))
+            rowids.append(getattr(row, "rowid", None))
+        return cls(columns, data, rowids)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __repr__(self) -> str:
+        return repr([dict(row) for row in self])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not (0 <= index < self.length):
+            raise IndexError("row index out of range")
+        return Row(((name, column[index]) for name, column in self.data.items()), rowid=self.rowids[index])
+
+    def __iter__(self):
+        names = list(self.data)
+        for rowid, *values in zip(self.rowids, *self.data.values()):
+            yield Row(zip(names, values), rowid=rowid)
+
+    def iter_values(self, names: list, start: int = 0, stop: int = None):
+        """
+        Yield the values of some columns, row by row, without building a Row for each.
+
+        :param names: The columns to read, in the order the values should come in.
+        :param start: The first row to read.
+        :param stop: The row to stop before, or None to read to the end.
+        :return: An iterator of tuples.
+        """
+        if not names:
+            return iter(())
+        columns = [self.data[name] for name in names]
+        if start == 0 and stop is None:
+            return zip(*columns)
+        # Read a window by index, so the cost depends on its size and not on where it starts
+        stop = self.length if stop is None else min(stop, self.length)
+        return (tuple(column[index] for column in columns) for index in range(start, stop))
+
+    def store(self, name: str, action) -> None:
+        """
+        Apply a change to a column, turning it into a list column first if its container
+        cannot hold the new value.
+        """
+        self.data[name] = self.data[name].writable()
+        try:
+            action(self.data[name])
+        except (TypeError, OverflowError):
+            self.data[name] = ListColumn(list(self.data[name]))
+            action(self.data[name])
+
+    def set_cell(self, index: int, name: str, value) -> Row:
+        """
+        Store a new value in a cell.
+
+        :param index: The row index.
+        :param name: The column name.
+        :param value: The new value.
+        :return: The row as it is after the change.
+        """
+        if not (0 <= index < self.length):
+            raise IndexError("row index out of range")
+
+        def assign(column):
+            column[index] = value
+
+        self.store(name, assign)
+        return self[index]
+
+    def append(self, row) -> None:
+        """
+        Add a row to the end of the table. It has no rowid until it is saved.
+
+        :param row: A mapping of column names to values; missing columns are left empty.
+        """
+        for name in self.data:
+            value = row.get(name)
+            self.store(name, lambda column: column.append(value))
+        self.rowids = self.rowids.writable()
+        self.rowids.append(getattr(row, "rowid", None))
+        self.length += 1
+
+    def pop(self, index: int = -1) -> Row:
+        if index < 0:
+            index += self.length
+        row = self[index]
+        for name, column in self.data.items():
+            self.data[name] = column.writable()
+            self.data[name].pop(index)
+        self.rowids = self.rowids.writable()
+        self.rowids.pop(index)
+        self.length -= 1
+        return row
+
+    def add_column(self, name: str, data_type: str) -> None:
+        """
+        Add a column of empty cells.
+        """
+        self.data[name] = COLUMN_CLASSES.get(data_type, ListColumn).of_nulls(self.length)
+
+    def rename_column(self, old_name: str, new_name: str) -> None:
+        self.data = {new_name if name == old_name else name: column for name, column in self.data.items()}
+
+    def remove_column(self, name: str) -> None:
+        self.data.pop(name, None)
+
+    def find_rows(self, name: str, value) -> list:
+        """
+        Get the indices of the rows whose cell in a column equals a value.
+
+        :param name: The column name.
+        :param value: The value to look for.
+        """
+        return self.data[name].find(value)
+
+    def count_values(self, name: str) -> Counter:
+        """
+        Count how many times each value appears in a column.
+
+        :param name: The column name.
+        """
+        return self.data[name].count_values()
+
+    def unsaved_positions(self) -> list:
+        """
+        Get the indices of the rows that have no rowid because they were never saved.
+        """
+        return list(self.rowids.nulls.set_positions())
+
+    def set_rowid(self, index: int, rowid: int) -> None:
+        self.rowids = self.rowids.writable()
+        self.rowids[index] = rowid
+
+    def number_rows(self) -> None:
+        """
+        Give the rows the rowids 1 to n, in order, as a full save stores them.
+        """
+        self.rowids = IntColumn.from_values(range(1, self.length + 1))
+
+    def nbytes(self) -> int:
+        """
+        Get roughly how much memory the column containers take, not counting the values
+        held in list columns.
+        """
+        return sum(column.nbytes() for column in self.data.values()) + self.rowids.nbytes()
@@ -0,0 +1,115 @@
+import csv
+import os
+from itertools import islice
+from typing import Iterable, Iterator
+from rich.console import Console
+from rich.progress import Progress, BarColumn, DownloadColumn, TextColumn, TimeRemainingColumn, TransferSpeedColumn
+from table_builder.type_inference import convert_rows, widen_column_types
+
+
+class ColumnTypesChanged(Exception):
+    def __init__(self, column_types: list):
+        """
+        Raised when a CSV file holds values that do not fit the column types guessed for it.
+
+        :param column_types: The types that every value of the file fits.
+        """
+        super().__init__("The column types of the file changed.")
+        self.column_types = column_types
+
+
+class CsvStream:
+    def __init__(self, path: str, chunk_size: int):
+        """
+        Read a CSV file a chunk of rows at a time.
+
+        Use it as a context manager. The first row is read as the header on entry, and
+        chunks() then yields the remaining rows, so no more than one chunk is held in
+        memory at once.
+
+        :param path: Path to the CSV file.
+        :param chunk_size: The number of rows per chunk.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.size = os.path.getsize(path)
+        self.file = None
+        self.reader = None
+        self.header = None
+
+    def __enter__(self):
+        self.file = open(self.path, 'r', encoding='utf-8', newline='')
+        self.reader = csv.reader(self.file)
+        self.header = next(self.reader, None)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.file.close()
+
+    def position(self) -> int:
+        """
+        Get roughly how many bytes of the file have been read so far.
+        """
+        # The text layer cannot report its position while being iterated, but the
+        # binary buffer underneath can
+        return self.file.buffer.tell()
+
+    def chunks(self):
+        """
+        Yield the data rows as lists of at most chunk_size rows.
+
+        Each row is padded or cut to the length of the header.
+        """
+        width = len(self.header)
+        while True:
+            chunk = list(islice(self.reader, self.chunk_size))
+            if not chunk:
+                return
+            for index, row in enumerate(chunk):
+                if len(row) != width:
+                    chunk[index] = (row + [""] * width)[:width]
+            yield chunk
+
+
+def convert_chunks(chunks: Iterable, column_types: list) -> Iterator[list]:
+    """
+    Convert chunks of raw CSV rows to the types guessed for their columns.
+
+    The chunks are converted as long as every value fits its column. Once one does not,
+    the rest of the chunks are read to find the types that every value fits, and
+    ColumnTypesChanged is raised with them. The rows converted so far then have to be
+    written again with the new types, for example by rolling back and starting over.
+
+    :param chunks: The raw rows, a chunk at a time, such as from CsvStream.chunks.
+    :param column_types: The type guessed for each column.
+    :return: The converted rows, a chunk at a time.
+    :raises ColumnTypesChanged: If a value does not fit its column's type.
+    """
+    chunks = iter(chunks)
+    for chunk in chunks:
+        if not chunk:
+            continue
+        rows, needed_types = convert_rows(chunk, column_types)
+        if needed_types != column_types:
+            for chunk in chunks:
+                needed_types = widen_column_types(chunk, needed_types)
+            raise ColumnTypesChanged(needed_types)
+        yield rows
+
+
+def create_csv_progress(console: Console) -> Progress:
+    """
+    Create a progress bar that tracks how many bytes of a CSV file have been read.
+
+    :param console: The console to draw the progress bar on.
+    :return: The progress bar, to be used as a context manager.
+    """
+    return Progress(
+        TextColumn("[bold yellow]{task.description}[/]"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        TimeRemainingColumn(),
+        console=console,
+        transient=True,
+    )
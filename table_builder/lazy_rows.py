@@ -0,0 +1,211 @@
+import sqlite3
+from bisect import bisect_right, insort
+from collections import Counter, OrderedDict
+from collections.abc import Sequence
+from database.sql_utils import quote_identifier
+from table_builder.change_tracker import ChangeTracker, Row
+from table_builder.column_store import ColumnStore
+
+
+# Rows fetched per page and how many pages stay in memory at once
+PAGE_SIZE = 1000
+MAX_CACHED_PAGES = 32
+
+
+class LazyRows(Sequence):
+    def __init__(self, connection: sqlite3.Connection, table: str, columns: list, row_count: int,
+                 change_tracker: ChangeTracker, page_size: int = PAGE_SIZE, max_pages: int = MAX_CACHED_PAGES):
+        """
+        A list of rows that reads a database table one page at a time, in rowid order.
+
+        Only the pages being looked at are kept, in a bounded LRU. Pages are found by keyset
+        pagination on rowid once their neighbour has been read, falling back to
+        LIMIT/OFFSET for jumps. Rows edited through the change tracker are kept in memory
+        and replace their stored copy whenever a page is read again. Appended rows stay in
+        memory until saved, and removed rows are skipped.
+
+        :param connection: Connection to the database holding the table.
+        :param table: The name of the table to read.
+        :param columns: The table's columns, with program types.
+        :param row_count: The number of rows stored in the table.
+        :param change_tracker: The tracker holding rows edited since the last save.
+        :param page_size: The number of rows per page.
+        :param max_pages: The number of pages kept in memory.
+        """
+        self.connection = connection
+        self.table = table
+        self.columns = columns
+        self.change_tracker = change_tracker
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.reset(row_count)
+
+    def reset(self, row_count: int) -> None:
+        """
+        Drop every loaded page and pending change, for when the stored table has been updated.
+
+        :param row_count: The number of rows now stored in the table.
+        """
+        self.stored_count = row_count
+        self.pages = OrderedDict()
+        self.page_last_rowids = {}
+        self.removed_positions = []
+        self.appended = []
+
+    def __len__(self) -> int:
+        return self.stored_count - len(self.removed_positions) + len(self.appended)
+
+    def __repr__(self) -> str:
+        return f"<{len(self)} rows read on demand from table '{self.table}'>"
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        position, appended_index = self.locate(index)
+        if appended_index is not None:
+            return self.appended[appended_index]
+        page = self.get_page(position // self.page_size)
+        return page[position % self.page_size]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def iter_values(self, names: list, start: int = 0, stop: int = None):
+        """
+        Yield the values of some columns, row by row.
+
+        :param names: The columns to read, in the order the values should come in.
+        :param start: The first row to read.
+        :param stop: The row to stop before, or None to read to the end.
+        :return: An iterator of tuples.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        for index in range(start, stop):
+            row = self[index]
+            yield tuple(row.get(name) for name in names)
+
+    def set_cell(self, index: int, name: str, value) -> Row:
+        """
+        Store a new value in a cell of a loaded row.
+
+        :return: The edited row, which stays in memory through the change tracker once
+            marked as updated.
+        """
+        row = self[index]
+        row[name] = value
+        return row
+
+    def find_rows(self, name: str, value) -> list:
+        """
+        Get the indices of the rows whose cell in a column equals a value, reading every page.
+        """
+        return [index for index, row in enumerate(self) if row.get(name) == value]
+
+    def count_values(self, name: str) -> Counter:
+        """
+        Count how many times each value appears in a column, reading every page.
+        """
+        return Counter(row.get(name) for row in self)
+
+    def unsaved_positions(self) -> list:
+        """
+        Get the indices of the appended rows that have no rowid because they were never saved.
+        """
+        start = len(self) - len(self.appended)
+        return [start + index for index, row in enumerate(self.appended) if row.rowid is None]
+
+    def set_rowid(self, index: int, rowid: int) -> None:
+        self[index].rowid = rowid
+
+    def append(self, row: Row) -> None:
+        self.appended.append(row)
+
+    def pop(self, index: int = -1) -> Row:
+        position, appended_index = self.locate(index)
+        if appended_index is not None:
+            return self.appended.pop(appended_index)
+        row = self[index]
+        insort(self.removed_positions, position)
+        return row
+
+    def locate(self, index: int) -> tuple:
+        """
+        Map a list index to a stored position, skipping removed rows.
+
+        :param index: The index into the list, which may be negative.
+        :return: The stored position and None, or None and the index into the appended rows.
+        :raises IndexError: If the index is out of range.
+        """
+        length = len(self)
+        if index < 0:
+            index += length
+        if not (0 <= index < length):
+            raise IndexError("row index out of range")
+
+        visible_stored = self.stored_count - len(self.removed_positions)
+        if index >= visible_stored:
+            return None, index - visible_stored
+
+        # Each removed position at or before the target pushes it one further along
+        skipped = bisect_right(self.removed_positions, index)
+        while True:
+            position = index + skipped
+            now_skipped = bisect_right(self.removed_positions, position)
+            if now_skipped == skipped:
+                return position, None
+            skipped = now_skipped
+
+    def get_page(self, page_number: int) -> list:
+        """
+        Get a page of stored rows, reading it from the database if it is not loaded.
+
+        :param page_number: The page to get.
+        :return: The rows on the page.
+        """
+        if page_number in self.pages:
+            self.pages.move_to_end(page_number)
+            return self.pages[page_number]
+
+        select = f"SELECT rowid, * FROM {quote_identifier(self.table)}"
+        if page_number == 0:
+            cursor = self.connection.execute(f"{select} ORDER BY rowid LIMIT ?", (self.page_size,))
+        elif page_number - 1 in self.page_last_rowids:
+            cursor = self.connection.execute(
+                f"{select} WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                (self.page_last_rowids[page_number - 1], self.page_size)
+            )
+        else:
+            cursor = self.connection.execute(
+                f"{select} ORDER BY rowid LIMIT ? OFFSET ?", (self.page_size, page_number * self.page_size)
+            )
+
+        edited = self.change_tracker.updated
+        page = []
+        for raw_row in cursor:
+            rowid = raw_row[0]
+            if rowid in edited:
+                page.append(edited[rowid])
+                continue
+            row = Row(rowid=rowid)
+            for column, value in zip(self.columns, raw_row[1:]):
+                if column["type"] == "bool" and value is not None:
+                    value = bool(value)  # Convert 1/0 to True/False
+                row[column["name"]] = value
+            page.append(row)
+
+        if page:
+            self.page_last_rowids[page_number] = page[-1].rowid
+        self.pages[page_number] = page
+        if len(self.pages) > self.max_pages:
+            self.pages.popitem(last=False)
+        return page
+
+    def materialize(self) -> ColumnStore:
+        """
+        Read every remaining row into an in-memory column store.
+
+        :return: The rows, including edits and appended rows.
+        """
+        return ColumnStore.from_rows(self.columns, self)
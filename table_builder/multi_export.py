@@ -0,0 +1,236 @@
+import csv
+import os
+import queue
+import threading
+import time
+from itertools import islice
+from typing import Iterable, NamedTuple
+from table_builder.csv_export import open_export_file
+from table_builder.ndjson import encode_header, encode_rows
+from table_builder.pdf_export import PDF_SAMPLE_ROWS, PdfTableWriter, measure_pdf_columns
+
+
+# Chunks that may wait for a background writer before the reader pauses
+QUEUED_EXPORT_CHUNKS = 8
+
+
+class ExportResult(NamedTuple):
+    """
+    How much one format writer wrote and how long it spent writing.
+    """
+    format: str
+    path: str
+    rows: int
+    seconds: float
+    size: int
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+
+class FormatSink:
+    """
+    A writer for one export format, fed the same chunks of rows as every other.
+
+    Subclasses open their file in start(), write a chunk in write() and finish the file in
+    finish(). The time spent in each is added up, so every format reports its own speed
+    even though the rows are read only once.
+    """
+    format = None
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows = 0
+        self.seconds = 0.0
+
+    def start(self, columns: list, title: str, total_rows: int) -> None:
+        pass
+
+    def write(self, chunk: list) -> None:
+        raise NotImplementedError
+
+    def finish(self) -> None:
+        pass
+
+    def timed(self, action, *args) -> None:
+        start = time.perf_counter()
+        action(*args)
+        self.seconds += time.perf_counter() - start
+
+    def add_chunk(self, chunk: list) -> None:
+        self.timed(self.write, chunk)
+        self.rows += len(chunk)
+
+    def close(self) -> None:
+        self.timed(self.finish)
+
+    def result(self) -> ExportResult:
+        return ExportResult(self.format, self.path, self.rows, self.seconds, os.path.getsize(self.path))
+
+
+class CsvSink(FormatSink):
+    format = "CSV"
+
+    def __init__(self, path: str, compress: bool = False):
+        super().__init__(path)
+        self.compress = compress
+        self.file = None
+        self.writer = None
+
+    def start(self, columns: list, title: str, total_rows: int) -> None:
+        self.file = open_export_file(self.path, self.compress)
+        self.writer = csv.writer(self.file)
+        if columns:
+            self.writer.writerow([column["name"] for column in columns])
+
+    def write(self, chunk: list) -> None:
+        self.writer.writerows(chunk)
+
+    def finish(self) -> None:
+        self.file.close()
+
+
+class NdjsonSink(FormatSink):
+    format = "NDJSON"
+
+    def __init__(self, path: str, compress: bool = False):
+        super().__init__(path)
+        self.compress = compress
+        self.file = None
+
+    def start(self, columns: list, title: str, total_rows: int) -> None:
+        self.file = open_export_file(self.path, self.compress)
+        self.file.write(encode_header(columns))
+
+    def write(self, chunk: list) -> None:
+        self.file.write(encode_rows(chunk))
+
+    def finish(self) -> None:
+        self.file.close()
+
+
+class PdfSink(FormatSink):
+    format = "PDF"
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.headers = None
+        self.title = None
+        self.total_rows = None
+        self.writer = None
+
+    def start(self, columns: list, title: str, total_rows: int) -> None:
+        self.headers = [column["name"] for column in columns]
+        self.title = title
+        self.total_rows = total_rows
+
+    def write(self, chunk: list) -> None:
+        # The columns are sized from the first chunk, so the rows are still read only once
+        if self.writer is None:
+            widths = measure_pdf_columns(self.headers, chunk[:PDF_SAMPLE_ROWS])
+            self.writer = PdfTableWriter(self.path, self.title, self.headers, widths, self.total_rows)
+        self.writer.add_rows(chunk)
+
+    def finish(self) -> None:
+        if self.writer is None:
+            self.write([])
+        self.writer.close()
+
+
+class BackgroundSink:
+    def __init__(self, sink: FormatSink):
+        """
+        Run a format writer on its own thread, so a slow format does not hold up the others.
+
+        Chunks wait in a bounded queue, and handing one over blocks only when the writer has
+        fallen that far behind. An error on the thread is raised again by close().
+
+        :param sink: The format writer to run.
+        """
+        self.sink = sink
+        self.chunks = queue.Queue(maxsize=QUEUED_EXPORT_CHUNKS)
+        self.error = None
+        self.thread = None
+
+    def start(self, columns: list, title: str, total_rows: int) -> None:
+        self.sink.start(columns, title, total_rows)
+        self.thread = threading.Thread(target=self.run, name=f"{self.sink.format} export", daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        while (chunk := self.chunks.get()) is not None:
+            if self.error is None:
+                try:
+                    self.sink.add_chunk(chunk)
+                except Exception as e:
+                    # Keep taking chunks, so the reader is never left waiting on a full queue
+                    self.error = e
+        if self.error is None:
+            try:
+                self.sink.close()
+            except Exception as e:
+                self.error = e
+
+    def add_chunk(self, chunk: list) -> None:
+        self.chunks.put(chunk)
+
+    def close(self) -> None:
+        self.chunks.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def result(self) -> ExportResult:
+        return self.sink.result()
+
+
+def close_sinks(sinks: list) -> list:
+    """
+    Finish every format writer, even if some of them fail.
+
+    :return: The errors raised while finishing.
+    """
+    errors = []
+    for sink in sinks:
+        try:
+            sink.close()
+        except Exception as e:
+            errors.append(e)
+    return errors
+
+
+def export_rows(rows: Iterable, columns: list, title: str, total_rows: int, sinks: list, chunk_size: int) -> list:
+    """
+    Read rows once and write every chunk to several format writers.
+
+    The chunks are tuples in lists that no writer changes, so writers on other threads can
+    share them.
+
+    :param rows: Iterable of value sequences, in column order.
+    :param columns: The columns, as dictionaries with a name and a type.
+    :param title: The table name, for formats that show one.
+    :param total_rows: The number of rows, for formats that show it.
+    :param sinks: The format writers, some of them possibly in a BackgroundSink.
+    :param chunk_size: The number of rows read at a time.
+    :return: An ExportResult for each writer, in the same order.
+    """
+    started = []
+    try:
+        for sink in sinks:
+            sink.start(columns, title, total_rows)
+            started.append(sink)
+
+        rows = iter(rows)
+        while chunk := [tuple(row) for row in islice(rows, chunk_size)]:
+            for sink in sinks:
+                sink.add_chunk(chunk)
+    except BaseException:
+        # Close whatever was opened, keeping the error that stopped the export
+        close_sinks(started)
+        raise
+
+    errors = close_sinks(started)
+    if errors:
+        raise errors[0]
+    return [sink.result() for sink in sinks]
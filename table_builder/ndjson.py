@@ -0,0 +1,147 @@
+import gzip
+import io
+import json
+import os
+from itertools import islice
+from typing import Callable, Iterable, TextIO
+
+
+# Table files are line-delimited JSON: a header line holding the columns, then one line per
+# row with the values as an array in column order, for example
+#     {"columns": [{"name": "id", "type": "int"}, {"name": "name", "type": "str"}]}
+#     [1, "first"]
+#     [2, "second"]
+# More rows can be appended to a file without rewriting it.
+NDJSON_EXTENSION = ".ndjson"
+
+ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_header(columns: list) -> str:
+    """
+    Encode the header line of a file, holding the columns and their types.
+    """
+    header = {"columns": [{"name": column["name"], "type": column["type"]} for column in columns]}
+    return ENCODER.encode(header) + "\n"
+
+
+def encode_rows(rows: list) -> str:
+    """
+    Encode rows as lines of a file, one JSON array per row.
+    """
+    return "".join(ENCODER.encode(list(row)) + "\n" for row in rows)
+
+
+def write_ndjson(file: TextIO, columns: list, rows: Iterable, chunk_size: int,
+                 on_chunk: Callable[[int], None] = None) -> int:
+    """
+    Write a header line and rows to a line-delimited JSON file, a chunk of rows at a time.
+
+    :param file: The open file, such as one from csv_export.open_export_file.
+    :param columns: The columns, as dictionaries with a name and a type.
+    :param rows: Iterable of value sequences, in column order.
+    :param chunk_size: The number of rows written at a time.
+    :param on_chunk: Called with the number of rows in each chunk after it is written.
+    :return: The number of rows written.
+    """
+    file.write(encode_header(columns))
+
+    rows = iter(rows)
+    written = 0
+    while chunk := list(islice(rows, chunk_size)):
+        file.write(encode_rows(chunk))
+        written += len(chunk)
+        if on_chunk:
+            on_chunk(len(chunk))
+    return written
+
+
+class NdjsonStream:
+    def __init__(self, path: str, chunk_size: int):
+        """
+        Read a line-delimited JSON table file a chunk of rows at a time.
+
+        Use it as a context manager, like CsvStream. The header line is read on entry, and
+        chunks() then yields the rows, so no more than one chunk is held in memory at once.
+        Files ending in .gz are decompressed as they are read.
+
+        :param path: Path to the file.
+        :param chunk_size: The number of rows per chunk.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.size = os.path.getsize(path)
+        self.raw = None
+        self.file = None
+        self.columns = None
+        self.line_number = 0
+
+    def __enter__(self):
+        self.raw = open(self.path, 'rb')
+        binary = gzip.GzipFile(fileobj=self.raw) if self.path.endswith('.gz') else self.raw
+        self.file = io.TextIOWrapper(binary, encoding='utf-8')
+        try:
+            self.columns = self.read_header()
+        except BaseException:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.file.close()
+        self.raw.close()
+
+    def read_header(self) -> list:
+        """
+        Read the header line.
+
+        :return: The columns, or None if the file is empty.
+        """
+        line = next(self.lines(), None)
+        if line is None:
+            return None
+        try:
+            header = json.loads(line)
+            columns = header["columns"]
+            return [{"name": str(column["name"]), "type": str(column.get("type", "str"))} for column in columns]
+        except (ValueError, TypeError, KeyError) as e:
+            raise ValueError(f"Line {self.line_number}: expected a header with the columns of the table.") from e
+
+    def lines(self):
+        """
+        Yield the lines of the file that are not blank.
+        """
+        for line in self.file:
+            self.line_number += 1
+            if line.strip():
+                yield line
+
+    def position(self) -> int:
+        """
+        Get roughly how many bytes of the file have been read so far.
+        """
+        return self.raw.tell()
+
+    def chunks(self):
+        """
+        Yield the rows as lists of at most chunk_size rows.
+
+        Each row is padded with None or cut to the number of columns.
+        """
+        width = len(self.columns)
+        lines = self.lines()
+        while True:
+            chunk = []
+            for line in islice(lines, self.chunk_size):
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    raise ValueError(f"Line {self.line_number}: {e}") from e
+                if not isinstance(row, list):
+                    raise ValueError(f"Line {self.line_number}: expected a row as a JSON array.")
+                if len(row) != width:
+                    row = (row + [None] * width)[:width]
+                chunk.append(row)
+            if not chunk:
+                return
+            yield chunk
@@ -0,0 +1,219 @@
+from typing import Iterable
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import LongTable, TableStyle
+from table_builder.plain_renderer import format_cell
+
+
+PDF_FONT = "Helvetica"
+PDF_HEADER_FONT = "Helvetica-Bold"
+PDF_FONT_SIZE = 8
+PDF_TITLE_FONT_SIZE = 12
+
+# Every row is one line high, so a page holds a known number of rows
+PDF_ROW_HEIGHT = 14
+PDF_MARGIN = 36
+PDF_CELL_PADDING = 3
+
+# Longer cells are cut short with an ellipsis, so no column takes a page to itself
+MAX_PDF_COLUMN_WIDTH = 180
+MIN_PDF_COLUMN_WIDTH = 24
+
+# The widest character of the font, as a share of the font size
+MAX_CHARACTER_WIDTH = 1.015
+
+# Rows measured to size the columns
+PDF_SAMPLE_ROWS = 1000
+
+# The style of every page, set up once. Row and column numbers count from the end where
+# needed, so it fits a page of any size.
+PDF_TABLE_STYLE = TableStyle([
+    ("FONTNAME", (0, 0), (-1, -1), PDF_FONT),
+    ("FONTSIZE", (0, 0), (-1, -1), PDF_FONT_SIZE),
+    ("LEFTPADDING", (0, 0), (-1, -1), PDF_CELL_PADDING),
+    ("RIGHTPADDING", (0, 0), (-1, -1), PDF_CELL_PADDING),
+    ("TOPPADDING", (0, 0), (-1, -1), 0),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+    ("FONTNAME", (0, 0), (-1, 0), PDF_HEADER_FONT),
+    ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
+    ("ALIGN", (0, 0), (0, -1), "RIGHT"),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+])
+
+
+def text_width(text: str, font: str = PDF_FONT) -> float:
+    return stringWidth(text, font, PDF_FONT_SIZE)
+
+
+def fit_text(text: str, width: float, font: str = PDF_FONT) -> str:
+    """
+    Cut a cell text short with an ellipsis so it fits a width.
+    """
+    # No character is wider than this, so short texts fit without being measured
+    if len(text) * PDF_FONT_SIZE * MAX_CHARACTER_WIDTH <= width or text_width(text, font) <= width:
+        return text
+    # Keep as many characters as fit, found by halving the range
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if text_width(text[:middle] + "…", font) <= width:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + "…"
+
+
+def measure_pdf_columns(headers: list, rows: Iterable) -> list:
+    """
+    Find the width of each column, in points, from its header and some of its cells.
+
+    :param headers: The column headers.
+    :param rows: The rows to measure, as sequences of cell values.
+    :return: The width of each column, padding included.
+    """
+    widths = [text_width(header, PDF_HEADER_FONT) for header in headers]
+    for row in rows:
+        for index, value in enumerate(row):
+            width = text_width(format_cell(value))
+            if width > widths[index]:
+                widths[index] = width
+    return [
+        min(max(width + 2 * PDF_CELL_PADDING, MIN_PDF_COLUMN_WIDTH), MAX_PDF_COLUMN_WIDTH)
+        for width in widths
+    ]
+
+
+def group_columns(widths: list, available_width: float, fixed_width: float) -> list:
+    """
+    Split the columns into groups that each fit across a page.
+
+    :param widths: The width of each column.
+    :param available_width: The width of the page inside its margins.
+    :param fixed_width: The width taken on every page by the row number column.
+    :return: The groups, as (first column, column to stop before) ranges.
+    """
+    groups = []
+    start, used = 0, fixed_width
+    for index, width in enumerate(widths):
+        if index > start and used + width > available_width:
+            groups.append((start, index))
+            start, used = index, fixed_width
+        used += width
+    groups.append((start, len(widths)))
+    return groups
+
+
+class PdfTableWriter:
+    def __init__(self, path: str, title: str, headers: list, widths: list, total_rows: int = None, pagesize=letter):
+        """
+        Write a table to a PDF file page by page, as its rows arrive.
+
+        Rows are gathered until they fill a page, and that page is drawn and released before
+        more rows are taken, so memory holds one page of rows however long the table is.
+        Every page repeats the column headers and numbers its rows. A table too wide for
+        the page is split into groups of columns, and each page of rows is printed once
+        per group, one after another.
+
+        Use it as a context manager, or call close() when done.
+
+        :param path: Path to the PDF file.
+        :param title: The title printed at the top of every page.
+        :param headers: The column headers.
+        :param widths: The width of each column, as from measure_pdf_columns.
+        :param total_rows: The number of rows, shown on each page if known.
+        :param pagesize: The page size.
+        """
+        self.title = title
+        self.headers = headers
+        self.total_rows = total_rows
+        self.page_width, self.page_height = pagesize
+        self.canvas = Canvas(path, pagesize=pagesize, pageCompression=1)
+        self.canvas.setTitle(title)
+
+        # The row number column is as wide as the largest row number needs
+        largest = str(total_rows) if total_rows is not None else "0000000"
+        self.number_width = max(text_width(largest), text_width("#", PDF_HEADER_FONT)) + 2 * PDF_CELL_PADDING
+        self.widths = [min(width, self.page_width - 2 * PDF_MARGIN - self.number_width) for width in widths]
+        self.groups = group_columns(self.widths, self.page_width - 2 * PDF_MARGIN, self.number_width)
+
+        table_height = self.page_height - 2 * PDF_MARGIN - 2 * PDF_TITLE_FONT_SIZE
+        self.rows_per_page = max(1, int(table_height // PDF_ROW_HEIGHT) - 1)
+        self.pending = []
+        self.rows_written = 0
+        self.pages = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def add_rows(self, rows: Iterable) -> None:
+        """
+        Add rows to the table, drawing every page they fill.
+
+        :param rows: The rows, as sequences of cell values in column order.
+        """
+        for row in rows:
+            self.pending.append(row)
+            if len(self.pending) == self.rows_per_page:
+                self.draw_pages()
+
+    def close(self) -> None:
+        """
+        Draw the last rows and finish the file.
+        """
+        if self.pending or not self.pages:
+            self.draw_pages()
+        self.canvas.save()
+
+    def draw_pages(self) -> None:
+        """
+        Draw the pending rows, once for each group of columns, and release them.
+        """
+        first_row = self.rows_written + 1
+        last_row = self.rows_written + len(self.pending)
+        # Format the cells once, as they are shared by every group of columns
+        cells = [[format_cell(value) for value in row] for row in self.pending]
+
+        for start, stop in self.groups:
+            widths = self.widths[start:stop]
+            # Headers are cut short like cells, in the bold font they are drawn in
+            data = [["#", *(fit_text(header, width - 2 * PDF_CELL_PADDING, PDF_HEADER_FONT)
+                            for header, width in zip(self.headers[start:stop], widths))]]
+            for number, row in enumerate(cells, start=first_row):
+                data.append([str(number), *(fit_text(text, width - 2 * PDF_CELL_PADDING)
+                                            for text, width in zip(row[start:stop], widths))])
+
+            table = LongTable(data, colWidths=[self.number_width, *widths], rowHeights=PDF_ROW_HEIGHT)
+            table.setStyle(PDF_TABLE_STYLE)
+            _, height = table.wrapOn(self.canvas, self.page_width - 2 * PDF_MARGIN, self.page_height)
+            top = self.page_height - PDF_MARGIN - 2 * PDF_TITLE_FONT_SIZE
+            table.drawOn(self.canvas, PDF_MARGIN, top - height)
+            self.draw_page_text(first_row, last_row, start, stop)
+            self.canvas.showPage()
+            self.pages += 1
+
+        self.rows_written = last_row
+        self.pending = []
+
+    def draw_page_text(self, first_row: int, last_row: int, start: int, stop: int) -> None:
+        """
+        Draw the title above the table and the rows, columns and page number below it.
+        """
+        self.canvas.setFont(PDF_HEADER_FONT, PDF_TITLE_FONT_SIZE)
+        self.canvas.drawString(PDF_MARGIN, self.page_height - PDF_MARGIN - PDF_TITLE_FONT_SIZE, self.title)
+
+        of_rows = f" of {self.total_rows}" if self.total_rows is not None else ""
+        footer = f"Rows {first_row}-{last_row}{of_rows}"
+        if len(self.groups) > 1:
+            footer += f", columns {start + 1}-{stop} of {len(self.headers)}"
+        footer += f"  ·  Page {self.pages + 1}"
+        self.canvas.setFont(PDF_FONT, PDF_FONT_SIZE)
+        self.canvas.drawString(PDF_MARGIN, PDF_MARGIN / 2, footer)
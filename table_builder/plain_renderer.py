@@ -0,0 +1,100 @@
+from itertools import islice
+from typing import Iterable, Iterator
+from rich.cells import cell_len, set_cell_size
+from rich.console import Console
+
+
+# The choices for the table_renderer setting
+TABLE_RENDERERS = ("auto", "rich", "plain")
+
+# Rows measured to size the columns of a table that is too large to measure in full
+PLAIN_SAMPLE_ROWS = 1000
+
+# Longer cells are cut short with an ellipsis
+MAX_PLAIN_COLUMN_WIDTH = 40
+
+# Lines written to the console at once
+PLAIN_BATCH_LINES = 1000
+
+COLUMN_SEPARATOR = " │ "
+RULE_SEPARATOR = "─┼─"
+
+
+def format_cell(value) -> str:
+    """
+    Turn a cell value into a single line of text.
+    """
+    text = str(value)
+    if "\n" in text or "\r" in text:
+        text = text.replace("\r\n", " ").replace("\n", " ").replace("\r", " ")
+    return text
+
+
+def measure_columns(headers: list, rows: Iterable, max_width: int = MAX_PLAIN_COLUMN_WIDTH) -> list:
+    """
+    Find the width of each column from its header and some of its cells.
+
+    Widths are in terminal cells, so wide characters such as CJK and emoji count twice.
+
+    :param headers: The column headers.
+    :param rows: The rows to measure, as sequences of cell values.
+    :param max_width: The widest a column may be.
+    :return: The width of each column.
+    """
+    widths = [cell_len(header) for header in headers]
+    for row in rows:
+        for index, value in enumerate(row):
+            length = cell_len(format_cell(value))
+            if length > widths[index]:
+                widths[index] = length
+    return [min(width, max_width) for width in widths]
+
+
+def format_line(cells: list, widths: list, right_aligned: int = 0) -> str:
+    """
+    Lay out one line of cells at fixed widths.
+
+    :param cells: The cell texts.
+    :param widths: The width of each column.
+    :param right_aligned: How many leading columns are right aligned, such as row numbers.
+    :return: The line.
+    """
+    parts = []
+    for index, (text, width) in enumerate(zip(cells, widths)):
+        length = cell_len(text)
+        if length > width:
+            # Pads with a space if a wide character would straddle the cut
+            text, length = set_cell_size(text, width - 1) + "…", width
+        padding = " " * (width - length)
+        parts.append(padding + text if index < right_aligned else text + padding)
+    return COLUMN_SEPARATOR.join(parts).rstrip()
+
+
+def render_plain_table(headers: list, rows: Iterable, widths: list, right_aligned: int = 0) -> Iterator[str]:
+    """
+    Render a table as plain text lines: a header, a rule and one line per row.
+
+    The lines are produced one at a time, so rows can be streamed from a large table.
+
+    :param headers: The column headers.
+    :param rows: The rows, as sequences of cell values.
+    :param widths: The width of each column, as from measure_columns.
+    :param right_aligned: How many leading columns are right aligned.
+    """
+    yield format_line(headers, widths, right_aligned)
+    yield RULE_SEPARATOR.join("─" * width for width in widths)
+    for row in rows:
+        yield format_line([format_cell(value) for value in row], widths, right_aligned)
+
+
+def write_lines(console: Console, lines: Iterator[str], batch_size: int = PLAIN_BATCH_LINES) -> None:
+    """
+    Write lines to the console in batches, without markup parsing, highlighting or wrapping.
+
+    :param console: The console to write to.
+    :param lines: The lines to write.
+    :param batch_size: The number of lines per write.
+    """
+    lines = iter(lines)
+    while batch := list(islice(lines, batch_size)):
+        console.out("\n".join(batch), highlight=False)
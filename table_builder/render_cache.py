@@ -0,0 +1,120 @@
+from collections.abc import Sequence
+from rich.cells import cell_len
+
+
+# Tables with more rows than this are rendered without caching, to keep memory bounded
+RENDER_CACHE_MAX_ROWS = 100000
+
+
+def text_width(text: str) -> int:
+    """
+    Get how many terminal cells the widest line of a text takes.
+    """
+    if "\n" in text:
+        return max(map(cell_len, text.splitlines()), default=0)
+    return cell_len(text)
+
+
+class RenderCache:
+    def __init__(self, max_rows: int = RENDER_CACHE_MAX_ROWS):
+        """
+        Keep the text of rendered cells, and the width of each column, between prints of a table.
+
+        Cells are turned into text the first time they are shown and kept until they
+        change, so printing a table again after an edit only formats the edited cells.
+        The table builder reports every edit to the cache; a change the cache was not told
+        about that alters the number of rows clears it, as a safeguard.
+
+        :param max_rows: The largest table whose cells are cached.
+        """
+        self.max_rows = max_rows
+        self.cells = {}
+        self.widths = {}
+        self.row_count = 0
+
+    def reset(self) -> None:
+        """
+        Forget every cached cell, for when the whole table has changed.
+        """
+        self.cells = {}
+        self.widths = {}
+        self.row_count = 0
+
+    def get_window(self, rows: Sequence, names: list, start: int, stop: int) -> list:
+        """
+        Get the text of the cells in a window of the table, formatting only those not cached yet.
+
+        :param rows: The table rows, a ColumnStore or LazyRows.
+        :param names: The columns in the window.
+        :param start: The first row in the window.
+        :param stop: The row to stop before.
+        :return: The text of the cells, as one list per column.
+        """
+        if len(rows) > self.max_rows:
+            self.reset()
+            return [[str(value) for (value,) in rows.iter_values([name], start, stop)] for name in names]
+
+        if len(rows) != self.row_count:
+            self.reset()
+            self.row_count = len(rows)
+
+        window = []
+        for name in names:
+            cells = self.cells.get(name)
+            if cells is None:
+                cells = self.cells[name] = [None] * self.row_count
+            if None in cells[start:stop]:
+                for index, (value,) in enumerate(rows.iter_values([name], start, stop), start=start):
+                    if cells[index] is None:
+                        cells[index] = str(value)
+            window.append(cells[start:stop])
+        return window
+
+    def get_width(self, rows: Sequence, name: str) -> int:
+        """
+        Get the width of the widest cell text in a column, formatting the whole column if needed.
+
+        :param rows: The table rows.
+        :param name: The column name.
+        """
+        width = self.widths.get(name)
+        if width is None or len(rows) != self.row_count:
+            cells = self.get_window(rows, [name], 0, len(rows))[0]
+            width = max(map(text_width, cells), default=0)
+            if len(rows) <= self.max_rows:
+                self.widths[name] = width
+        return width
+
+    def cell_changed(self, index: int, name: str) -> None:
+        cells = self.cells.get(name)
+        if cells is not None and index < len(cells):
+            cells[index] = None
+        self.widths.pop(name, None)
+
+    def row_added(self) -> None:
+        """
+        Make room for a row appended to the table.
+        """
+        if not self.row_count and not self.cells:
+            return
+        for cells in self.cells.values():
+            cells.append(None)
+        self.row_count += 1
+        self.widths = {}
+
+    def row_removed(self, index: int) -> None:
+        for cells in self.cells.values():
+            if index < len(cells):
+                cells.pop(index)
+        self.row_count = max(0, self.row_count - 1)
+        self.widths = {}
+
+    def column_renamed(self, old_name: str, new_name: str) -> None:
+        if old_name in self.cells:
+            self.cells[new_name] = self.cells.pop(old_name)
+        if old_name in self.widths:
+            self.widths[new_name] = self.widths.pop(old_name)
+
+    def column_removed(self, name: str) -> None:
+        self.cells.pop(name, None)
+        self.widths.pop(name, None)
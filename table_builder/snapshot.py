@@ -0,0 +1,336 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from typing import BinaryIO, NamedTuple
+from table_builder.column_store import (
+    ArrayColumn, Bitmap, BoolColumn, ColumnStore, DictionaryColumn, FloatColumn, IntColumn, ListColumn
+)
+
+
+# A snapshot file is laid out as
+#     MAGIC
+#     one section per column part, each starting on an 8 byte boundary
+#     the table of contents, as UTF-8 JSON
+#     the length of the table of contents, as a little-endian unsigned 64-bit integer
+#     MAGIC
+# The table of contents is written last, once the position of every section is known, so
+# the sections can be streamed out without holding the table twice. It names the table,
+# its columns with their types, and for each column its kind and where its sections are.
+#
+# A snapshot does not remember the database table its rows came from. That table may have
+# changed by the time the snapshot is opened, so the rows are saved to it in full.
+MAGIC = b"TTBSNAP1"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_EXTENSION = ".ttbsnap"
+
+SECTION_ALIGNMENT = 8
+
+# Encoded text is written to the file in blocks of about this many bytes
+TEXT_BLOCK_SIZE = 1024 * 1024
+
+FOOTER = struct.Struct("<Q")
+
+# The column classes kept as an array of numbers, by their kind in the table of contents
+ARRAY_COLUMN_KINDS = {"int": IntColumn, "float": FloatColumn}
+
+
+class Snapshot(NamedTuple):
+    """
+    A table opened from a snapshot file.
+    """
+    name: str
+    columns: list
+    rows: ColumnStore
+
+
+class MappedTextColumn:
+    """
+    A read-only column of text in a snapshot, decoded a cell at a time as it is read.
+
+    The cells are stored back to back as UTF-8, with an array of offsets marking where each
+    one starts, so reading a cell only touches the pages that hold it. Cells of columns that
+    held values other than text are stored as JSON and decoded with it.
+    """
+
+    def __init__(self, offsets: memoryview, text: memoryview, nulls: Bitmap, is_json: bool):
+        self.offsets = offsets
+        self.text = text
+        self.nulls = nulls
+        self.is_json = is_json
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if self.nulls[index]:
+            return None
+        text = str(self.text[self.offsets[index]:self.offsets[index + 1]], "utf-8")
+        return json.loads(text) if self.is_json else text
+
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+
+    def writable(self) -> ListColumn:
+        return ListColumn(list(self))
+
+    def find(self, value) -> list:
+        return [index for index, cell in enumerate(self) if cell == value]
+
+    def count_values(self) -> Counter:
+        return Counter(self)
+
+    def nbytes(self) -> int:
+        return len(self.offsets) * 8 + len(self.text) + len(self.nulls.bits)
+
+
+class SnapshotWriter:
+    def __init__(self, file: BinaryIO):
+        """
+        Write the sections of a snapshot, keeping track of where each one lands.
+
+        :param file: The file, open for binary writing, positioned just after MAGIC.
+        """
+        self.file = file
+        self.position = len(MAGIC)
+
+    def align(self) -> None:
+        padding = -self.position % SECTION_ALIGNMENT
+        if padding:
+            self.file.write(bytes(padding))
+            self.position += padding
+
+    def write(self, data) -> dict:
+        """
+        Write one section.
+
+        :param data: Any bytes-like object, such as an array or a bytearray.
+        :return: The offset and length of the section, for the table of contents.
+        """
+        self.align()
+        data = memoryview(data).cast("B")
+        self.file.write(data)
+        offset = self.position
+        self.position += len(data)
+        return {"offset": offset, "length": len(data)}
+
+    def write_bitmap(self, bitmap: Bitmap) -> dict:
+        return self.write(bitmap.bits)
+
+    def write_text(self, values) -> dict:
+        """
+        Write a column of any values as text sections: the encoded cells, their offsets and
+        a bitmap of empty cells. The cells are stored as plain text if every one is a string,
+        or as JSON otherwise.
+
+        :param values: The values, in a list or another sequence that can be read twice.
+        """
+        is_json = not all(value is None or type(value) is str for value in values)
+        encode = (lambda value: json.dumps(value, ensure_ascii=False)) if is_json else str
+
+        self.align()
+        text_offset = self.position
+        offsets = array("q", [0])
+        nulls = Bitmap()
+        block, block_size, end = [], 0, 0
+        for value in values:
+            nulls.append(value is None)
+            if value is not None:
+                encoded = encode(value).encode("utf-8")
+                block.append(encoded)
+                block_size += len(encoded)
+                end += len(encoded)
+                if block_size >= TEXT_BLOCK_SIZE:
+                    self.file.write(b"".join(block))
+                    block, block_size = [], 0
+            offsets.append(end)
+        self.file.write(b"".join(block))
+        self.position += end
+
+        return {
+            "count": len(nulls),
+            "encoding": "json" if is_json else "utf-8",
+            "text": {"offset": text_offset, "length": end},
+            "offsets": self.write(offsets),
+            "nulls": self.write_bitmap(nulls),
+        }
+
+    def write_column(self, column) -> dict:
+        """
+        Write a column in the sections that suit its container.
+
+        :return: The column's entry in the table of contents.
+        """
+        if isinstance(column, ArrayColumn):
+            return {
+                "kind": next(kind for kind, column_class in ARRAY_COLUMN_KINDS.items() if isinstance(column, column_class)),
+                "values": self.write(column.values),
+                "nulls": self.write_bitmap(column.nulls),
+                "null_count": column.null_count,
+            }
+        if isinstance(column, BoolColumn):
+            return {
+                "kind": "bool",
+                "values": self.write_bitmap(column.values),
+                "nulls": self.write_bitmap(column.nulls),
+                "null_count": column.null_count,
+            }
+        if isinstance(column, DictionaryColumn):
+            return {
+                "kind": "dictionary",
+                "codes": self.write(column.codes),
+                "code_type": column.codes.typecode if isinstance(column.codes, array) else column.codes.format,
+                "dictionary": self.write_text(column.dictionary),
+            }
+        if isinstance(column, ListColumn):
+            return {"kind": "text", **self.write_text(column.values)}
+        if isinstance(column, MappedTextColumn):
+            # Text that is still as it was read from a snapshot is copied without decoding it
+            return {
+                "kind": "text",
+                "count": len(column),
+                "encoding": "json" if column.is_json else "utf-8",
+                "text": self.write(column.text),
+                "offsets": self.write(column.offsets),
+                "nulls": self.write_bitmap(column.nulls),
+            }
+        return {"kind": "text", **self.write_text(list(column))}
+
+
+def save_snapshot(path: str, name: str, columns: list, rows: ColumnStore) -> int:
+    """
+    Save a table as a snapshot file.
+
+    Each column is written as it is kept in memory, so saving is mostly a matter of copying
+    its containers to the file. The file is written under a temporary name and then moved
+    into place, so a snapshot that is open from the same path keeps reading the old file.
+
+    :param path: Path to the snapshot file.
+    :param name: The table name.
+    :param columns: The columns, with program types.
+    :param rows: The table rows.
+    :return: The size of the file in bytes.
+    """
+    temporary_path = path + ".tmp"
+    try:
+        with open(temporary_path, "wb") as file:
+            file.write(MAGIC)
+            writer = SnapshotWriter(file)
+            contents = {
+                "version": SNAPSHOT_VERSION,
+                "byteorder": sys.byteorder,
+                "name": name,
+                "rows": len(rows),
+                "columns": [
+                    {"name": column["name"], "type": column["type"], **writer.write_column(rows.data[column["name"]])}
+                    for column in columns
+                ],
+            }
+            table_of_contents = json.dumps(contents).encode("utf-8")
+            file.write(table_of_contents)
+            file.write(FOOTER.pack(len(table_of_contents)))
+            file.write(MAGIC)
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+    return os.path.getsize(path)
+
+
+class SnapshotReader:
+    def __init__(self, view: memoryview, byteorder: str):
+        """
+        Build columns over the sections of a mapped snapshot.
+
+        :param view: A view of the whole file.
+        :param byteorder: The byte order the file was written in.
+        """
+        self.view = view
+        self.swap = byteorder != sys.byteorder
+
+    def section(self, entry: dict) -> memoryview:
+        return self.view[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def read_array(self, entry: dict, typecode: str):
+        """
+        View a section as an array of numbers without copying it, unless the file was
+        written on a machine with the other byte order.
+        """
+        values = self.section(entry).cast(typecode)
+        if self.swap:
+            values = array(typecode, values.tobytes())
+            values.byteswap()
+        return values
+
+    def read_bitmap(self, entry: dict, size: int) -> Bitmap:
+        return Bitmap.from_bits(self.section(entry), size)
+
+    def read_text(self, entry: dict) -> MappedTextColumn:
+        return MappedTextColumn(
+            self.read_array(entry["offsets"], "q"),
+            self.section(entry["text"]),
+            self.read_bitmap(entry["nulls"], entry["count"]),
+            entry["encoding"] == "json",
+        )
+
+    def read_column(self, entry: dict, size: int):
+        """
+        Build a column from its entry in the table of contents.
+        """
+        kind = entry["kind"]
+        if kind in ARRAY_COLUMN_KINDS:
+            column = ARRAY_COLUMN_KINDS[kind]()
+            column.values = self.read_array(entry["values"], column.typecode)
+            column.nulls = self.read_bitmap(entry["nulls"], size)
+            column.null_count = entry["null_count"]
+            return column
+        if kind == "bool":
+            column = BoolColumn()
+            column.values = self.read_bitmap(entry["values"], size)
+            column.nulls = self.read_bitmap(entry["nulls"], size)
+            column.null_count = entry["null_count"]
+            return column
+        if kind == "dictionary":
+            return DictionaryColumn.from_dictionary(
+                list(self.read_text(entry["dictionary"])), self.read_array(entry["codes"], entry["code_type"])
+            )
+        if kind == "text":
+            return self.read_text(entry)
+        raise ValueError(f"Unknown column kind '{kind}'.")
+
+
+def open_snapshot(path: str) -> Snapshot:
+    """
+    Open a snapshot file by mapping it into memory.
+
+    Nothing is read up front but the table of contents and the distinct values of dictionary
+    encoded columns. Numeric and bool columns are views of the mapped file, and text is
+    decoded a cell at a time, so only the pages that are read are loaded from disk. A
+    column is copied into memory the first time it is changed.
+
+    :param path: Path to the snapshot file.
+    :return: The table.
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+
+    trailer = len(MAGIC) + FOOTER.size
+    if len(view) < len(MAGIC) + trailer or view[:len(MAGIC)] != MAGIC or view[-len(MAGIC):] != MAGIC:
+        raise ValueError("Not a table snapshot file.")
+    (contents_length,) = FOOTER.unpack(view[-trailer:-len(MAGIC)])
+    contents = json.loads(str(view[-trailer - contents_length:-trailer], "utf-8"))
+    if contents["version"] > SNAPSHOT_VERSION:
+        raise ValueError("The snapshot was saved by a newer version of the app.")
+
+    size = contents["rows"]
+    reader = SnapshotReader(view, contents["byteorder"])
+    columns = [{"name": entry["name"], "type": entry["type"]} for entry in contents["columns"]]
+    data = {entry["name"]: reader.read_column(entry, size) for entry in contents["columns"]}
+    rows = ColumnStore.from_containers(data, IntColumn.of_nulls(size), size)
+    return Snapshot(contents["name"], columns, rows)
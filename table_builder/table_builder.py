@@ -1,15 +1,42 @@
+from rich.markup import escape
 from rich.table import Table
+from rich.text import Text
 from message_panel.message_panel import MessagePanel
-import csv
 import os
-from autocomplete.autocomplete import Autocomplete
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table as PDFTable, TableStyle
-from reportlab.lib import colors
 import json
+import sqlite3
+import time
+from itertools import chain, islice
+from autocomplete.autocomplete import Autocomplete
 from rich.panel import Panel
 from settings.settings import Settings
 from rich.console import Console
+from tqdm import tqdm
+from database.search_index import SearchIndex
+from database.bulk_writer import build_insert_statement, build_update_statement, bulk_insert, WriteStats
+from database.sql_utils import quote_identifier
+from database.import_manifest import ImportManifest
+from table_builder.change_tracker import ChangeTracker, Row
+from table_builder.lazy_rows import LazyRows
+from table_builder.column_store import ColumnStore
+from table_builder.csv_export import open_export_file, fetch_table_rows, write_csv
+from table_builder.csv_import import ColumnTypesChanged, CsvStream, convert_chunks, create_csv_progress
+from table_builder.multi_export import BackgroundSink, CsvSink, NdjsonSink, PdfSink, export_rows
+from table_builder.ndjson import NDJSON_EXTENSION, NdjsonStream, write_ndjson
+from table_builder.batch_import import find_csv_files, parse_csv_files_parallel
+from table_builder.snapshot import SNAPSHOT_EXTENSION, save_snapshot, open_snapshot
+from table_builder.render_cache import RenderCache, text_width
+from table_builder.pdf_export import PDF_SAMPLE_ROWS, PdfTableWriter, measure_pdf_columns
+from table_builder.plain_renderer import PLAIN_SAMPLE_ROWS, MAX_PLAIN_COLUMN_WIDTH, measure_columns, render_plain_table, write_lines
+from table_builder.type_inference import RowSampler, infer_column_types, fit_type, convert_value, value_fits
+
+# Width of the row number column of a table page, and the narrowest a data column is squeezed to
+PAGE_ROW_NUMBER_WIDTH = 10
+MIN_PAGE_COLUMN_WIDTH = 16
+
+# Rows shown above and below a cell picked for editing
+EDIT_CONTEXT_ROWS = 2
+
 
 class TableBuilder:
     def __init__(self, console: Console, settings: Settings, database):
@@ -26,12 +53,19 @@ class TableBuilder:
         self.settings = settings
         self.message_panel = MessagePanel(self.console)
         self.name = self.name_table()
-        self.table_data = {"columns": [], "rows": []}
+        self.table_data = {"columns": [], "rows": ColumnStore()}
+        self.change_tracker = ChangeTracker()
         self.table_saved = False
+        self.view_start = 0
+        self.view_first_column = 0
+        self.render_cache = RenderCache()
 
     def save_table_to_pdf(self):
         """
         Save the current table data to a PDF file.
+
+        The rows are laid out a page at a time, with the headers repeated on every page and
+        wide tables split across pages by groups of columns.
         """
         if not self.table_data["columns"] or not self.table_data["rows"]:
             self.message_panel.create_error_message("No table data to export to PDF.")
@@ -51,37 +85,19 @@ class TableBuilder:
             return
 
         try:
-            # Create the PDF document
-            pdf = SimpleDocTemplate(file_name, pagesize=letter)
-            elements = []
-
-            # Prepare the table data for the PDF
-            # Extract column names from the dictionaries
-            column_headers = [column["name"] for column in self.table_data["columns"]]
-            pdf_data = [column_headers]  # Header row
-
-            # Add row data
-            for row in self.table_data["rows"]:
-                pdf_data.append([row.get(column["name"], "") for column in self.table_data["columns"]])
-
-            # Create the table with styling
-            table = PDFTable(pdf_data)
-            table.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, 0), colors.grey),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
-                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("BOTTOMPADDING", (0, 0), (-1, 0), 12),
-                ("BACKGROUND", (0, 1), (-1, -1), colors.beige),
-                ("GRID", (0, 0), (-1, -1), 1, colors.black),
-            ]))
-
-            elements.append(table)
-
-            # Build the PDF
-            pdf.build(elements)
+            start = time.perf_counter()
+            column_names = [column["name"] for column in self.table_data["columns"]]
+            rows = self.table_data["rows"]
+
+            # Size the columns from the first rows, then stream every row onto the pages
+            widths = measure_pdf_columns(column_names, rows.iter_values(column_names, 0, PDF_SAMPLE_ROWS))
+            with PdfTableWriter(file_name, self.name, column_names, widths, len(rows)) as writer:
+                writer.add_rows(rows.iter_values(column_names))
+            seconds = time.perf_counter() - start
+
             self.message_panel.create_information_message(
-                f"Table data successfully exported to '[bold cyan]{file_name}[/]'."
+                f"Table data successfully exported to '[bold cyan]{file_name}[/]' "
+                f"([bold cyan]{writer.pages}[/] pages in [bold cyan]{seconds:.2f}[/] seconds)."
             )
         except Exception as e:
             self.message_panel.create_error_message(f"Failed to save table as PDF: {e}")
@@ -109,53 +125,180 @@ class TableBuilder:
 
         try:
             # Safely quote the table name
-            quoted_table_name = f'"{self.name}"'
+            quoted_table_name = quote_identifier(self.name)
 
             # Generate columns definition with data types
-            columns_definition = []
-            for column in self.table_data["columns"]:
-                column_name = f'"{column["name"]}"'
-                column_type = column["type"].upper()
-                if column_type == "STR":
-                    column_type = "TEXT"  # Map 'str' to SQLite 'TEXT'
-                elif column_type == "INT":
-                    column_type = "INTEGER"
-                elif column_type == "FLOAT":
-                    column_type = "REAL"
-                elif column_type == "BOOL":
-                    column_type = "BOOLEAN"
-                else:
-                    self.message_panel.create_error_message(f"Unsupported data type for column '[bold cyan]{column['name']}': {column['type']}[/]'")
-                    return
+            columns_definition_str = self.get_columns_definition(self.table_data["columns"])
 
-                columns_definition.append(f"{column_name} {column_type}")
-            columns_definition_str = ", ".join(columns_definition)
+            # Only a table that is already stored, and holds the rows the changes were tracked
+            # against, can be brought up to date with the changes alone
+            source = self.get_save_source()
+            incremental = self.name in self.database.get_tables() and self.change_tracker.can_save_incrementally(
+                source, self.database.get_row_count(self.name)
+            )
 
             # Create the table if it does not exist
             self.database.cursor.execute(f"CREATE TABLE IF NOT EXISTS {quoted_table_name} ({columns_definition_str})")
 
-            # Clear existing data
-            self.database.cursor.execute(f"DELETE FROM {quoted_table_name}")
-
-            # Insert rows
-            for row in self.table_data["rows"]:
-                column_names = ", ".join(f'"{col["name"]}"' for col in self.table_data["columns"])
-                placeholders = ", ".join("?" for _ in self.table_data["columns"])
-                values = [row.get(col["name"], None) for col in self.table_data["columns"]]
-                self.database.cursor.execute(
-                    f"INSERT INTO {quoted_table_name} ({column_names}) VALUES ({placeholders})", values
-                )
+            if incremental:
+                # The table is already stored; only write what changed since then
+                stats = self.save_changes_to_database()
+            else:
+                # A lazily loaded table reads its rows from the table about to be cleared
+                rows = self.table_data["rows"]
+                if isinstance(rows, LazyRows) and rows.table == self.name:
+                    self.ensure_rows_in_memory()
+
+                # Clear existing data
+                self.database.cursor.execute(f"DELETE FROM {quoted_table_name}")
+
+                # Insert rows in chunks, building the statement only once. Rows are numbered
+                # explicitly so each one knows its rowid for later incremental saves.
+                column_names = [col["name"] for col in self.table_data["columns"]]
+                statement = build_insert_statement(self.name, column_names, with_rowid=True)
+
+                rows = self.table_data["rows"]
+                numbered_rows = ((rowid, *values) for rowid, values in enumerate(rows.iter_values(column_names), start=1))
+                stats = bulk_insert(self.database.connection, statement, numbered_rows, self.settings.get_save_chunk_size(),
+                                    atomic=True)
+                if isinstance(rows, ColumnStore):
+                    rows.number_rows()
+                self.change_tracker.reset(source, stats.rows)
+
+            # A lazily loaded table now reads the saved rows, which are in the same order
+            rows = self.table_data["rows"]
+            if isinstance(rows, LazyRows):
+                rows.table = self.name
+                rows.reset(self.database.get_row_count(self.name))
+
+            # Rebuild the table's search index if its columns no longer match
+            SearchIndex(self.database.connection).sync(self.name)
 
-            self.database.connection.commit()
             self.table_saved = True
             self.message_panel.create_information_message(
-                f"Table '[bold cyan]{self.name}[/]' saved to database '[bold red]{self.database.get_current_database()}[/]'."
+                f"Table '[bold cyan]{self.name}[/]' saved to database '[bold red]{self.database.get_current_database()}[/]'. "
+                f"Wrote [bold cyan]{stats.rows}[/] rows in {stats.seconds:.2f}s ([bold cyan]{stats.rows_per_second:,.0f}[/] rows/s)."
             )
         except Exception as e:
             self.message_panel.create_error_message(f"Failed to save table to database: {e}")
 
+    @staticmethod
+    def get_columns_definition(columns: list) -> str:
+        """
+        Build the column list for a CREATE TABLE statement, mapping program types to SQLite types.
+
+        Args:
+            columns (list): The columns, with program types.
+
+        Returns:
+            str: The column definitions, separated by commas.
+
+        Raises:
+            ValueError: If a column has an unsupported type.
+        """
+        sql_types = {
+            "str": "TEXT",
+            "int": "INTEGER",
+            "float": "REAL",
+            "bool": "BOOLEAN"
+        }
+        columns_definition = []
+        for column in columns:
+            column_type = sql_types.get(column["type"].lower())
+            if column_type is None:
+                raise ValueError(f"Unsupported data type for column '{column['name']}': {column['type']}")
+            columns_definition.append(f"{quote_identifier(column['name'])} {column_type}")
+        return ", ".join(columns_definition)
+
+    def get_save_source(self) -> tuple:
+        """
+        Identify the database table the current rows would be saved to.
+
+        Returns:
+            tuple: The database path, the table name and the column definitions.
+        """
+        columns = tuple((column["name"], column["type"]) for column in self.table_data["columns"])
+        return self.database.database_path, self.name, columns
+
+    def forget_stored_table(self, table_name: str) -> None:
+        """
+        Stop tracking changes against a database table that was dropped or rewritten, so the
+        next save writes the table in full.
+
+        Args:
+            table_name (str): The table in the connected database.
+        """
+        source = self.change_tracker.source
+        if source is not None and source[:2] == (self.database.database_path, table_name):
+            self.change_tracker.reset()
+
+    def save_changes_to_database(self) -> WriteStats:
+        """
+        Write only the rows that were edited, added or removed since the last save or load.
+
+        Returns:
+            WriteStats: The number of rows written and how long it took.
+        """
+        connection = self.database.connection
+        column_names = [col["name"] for col in self.table_data["columns"]]
+        tracker = self.change_tracker
+        rows = self.table_data["rows"]
+        start = time.perf_counter()
+
+        # Added rows are the ones that have no rowid yet
+        unsaved_positions = rows.unsaved_positions()
+        new_rowids = []
+
+        try:
+            connection.executemany(
+                f"DELETE FROM {quote_identifier(self.name)} WHERE rowid = ?",
+                [(rowid,) for rowid in tracker.deleted]
+            )
+            connection.executemany(
+                build_update_statement(self.name, column_names),
+                [(*(row.get(name) for name in column_names), rowid) for rowid, row in tracker.updated.items()]
+            )
+            statement = build_insert_statement(self.name, column_names)
+            for position in unsaved_positions:
+                row = rows[position]
+                cursor = connection.execute(statement, [row.get(name) for name in column_names])
+                new_rowids.append(cursor.lastrowid)
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+
+        # Only hand out the new rowids once they are committed
+        for position, rowid in zip(unsaved_positions, new_rowids):
+            rows.set_rowid(position, rowid)
+
+        written = len(tracker.deleted) + len(tracker.updated) + len(unsaved_positions)
+        tracker.reset(tracker.source, tracker.stored_rows - len(tracker.deleted) + len(unsaved_positions))
+        return WriteStats(written, time.perf_counter() - start)
+
 
             
+    def get_table_columns(self, table_name: str) -> list:
+        """
+        Get the columns of a database table with their program types.
+
+        Args:
+            table_name (str): The name of the table.
+
+        Returns:
+            list: The columns, as dictionaries with a name and a type.
+        """
+        columns_info = self.database.get_columns(table_name)
+
+        # Map SQL types back to program types
+        sql_to_program_types = {
+            "TEXT": "str",
+            "INTEGER": "int",
+            "REAL": "float",
+            "BOOLEAN": "bool"
+        }
+        return [{"name": col["name"], "type": sql_to_program_types.get(col["type"].upper(), "str")} for col in columns_info]
+
     def load_from_database(self) -> None:
         """
         Load a table from the connected database, including column data types.
@@ -164,8 +307,7 @@ class TableBuilder:
             return
 
         try:
-            self.database.cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in self.database.cursor.fetchall()]
+            tables = self.database.get_tables()
 
             if not tables:
                 self.message_panel.create_error_message("No tables found in database.")
@@ -184,40 +326,40 @@ class TableBuilder:
             quoted_table_name = f'"{table_name}"'
 
             # Fetch column information
-            self.database.cursor.execute(f"PRAGMA table_info({quoted_table_name})")
-            columns_info = self.database.cursor.fetchall()
-
-            # Map SQL types back to program types
-            sql_to_program_types = {
-                "TEXT": "str",
-                "INTEGER": "int",
-                "REAL": "float",
-                "BOOLEAN": "bool"
-            }
-            columns = [{"name": col[1], "type": sql_to_program_types.get(col[2].upper(), "str")} for col in columns_info]
-
-            # Fetch rows
-            self.database.cursor.execute(f"SELECT * FROM {quoted_table_name}")
-            raw_rows = self.database.cursor.fetchall()
-
-            # Convert rows to dictionaries and handle boolean conversion
-            rows = []
-            for raw_row in raw_rows:
-                row = {}
+            columns = self.get_table_columns(table_name)
+
+            row_count = self.database.get_row_count(table_name)
+            lazy = row_count > self.settings.get_lazy_load_threshold()
+            if lazy:
+                # Large tables are read a page at a time as rows are viewed or edited
+                rows = LazyRows(self.database.connection, table_name, columns, row_count, self.change_tracker)
+            else:
+                # Fetch rows along with their rowids, a chunk at a time, straight into columns
+                self.database.cursor.execute(f"SELECT rowid, * FROM {quoted_table_name}")
+                rowids = []
+                data = [[] for _ in columns]
+                while chunk := self.database.cursor.fetchmany(self.settings.get_save_chunk_size()):
+                    for values, chunk_values in zip([rowids, *data], zip(*chunk)):
+                        values.extend(chunk_values)
+
+                # Convert 1/0 to True/False in bool columns
                 for idx, column in enumerate(columns):
-                    value = raw_row[idx]
                     if column["type"] == "bool":
-                        value = bool(value)  # Convert 1/0 to True/False
-                    row[column["name"]] = value
-                rows.append(row)
+                        data[idx] = [None if value is None else bool(value) for value in data[idx]]
+
+                rows = ColumnStore(columns, {column["name"]: values for column, values in zip(columns, data)}, rowids)
 
             self.table_data["columns"] = columns
             self.table_data["rows"] = rows
 
             self.name = table_name
+            self.change_tracker.reset(self.get_save_source(), row_count)
+            self.view_start = self.view_first_column = 0
+            self.render_cache.reset()
             self.table_saved = True
             self.message_panel.create_information_message(
                 f"Table '[bold cyan]{table_name}[/]' loaded successfully from database '[bold red]{self.database.get_current_database()}[/]'."
+                + (f" Its [bold cyan]{row_count}[/] rows are read from the database as they are needed." if lazy else "")
             )
             if self.settings.get_autoprint_table() == "on":
                 self.print_table()
@@ -233,8 +375,7 @@ class TableBuilder:
             return
 
         try:
-            self.database.cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in self.database.cursor.fetchall()]
+            tables = self.database.get_tables()
 
             if tables:
                 self.console.print("[bold green]Available Tables:[/]")
@@ -245,34 +386,61 @@ class TableBuilder:
         except Exception as e:
             self.message_panel.create_error_message(f"Failed to list tables: {e}")
         
-    def save_to_csv(self) -> None:
+    def ask_file_name(self, default_name: str, extension: str) -> str:
         """
-        Save the current table data to a CSV file.
+        Ask whether to name a file after the table, or for another name.
+
+        Args:
+            default_name (str): The name to use if the user agrees, usually the table name.
+            extension (str): The file extension, including the dot.
+
+        Returns:
+            str: The file name, or None if the answer was invalid.
         """
         use_table_name = self.console.input(
             "[bold yellow]Use table name as save file name? (y/n)[/]: ").lower().strip()
 
         if use_table_name == "y":
-            file_name = f"{self.name}.csv"
+            return f"{default_name}{extension}"
         elif use_table_name == "n":
-            file_name = self.console.input(
-                "[bold yellow]Enter the name of the file (without extension)[/]: ") + ".csv"
-        else:
+            return self.console.input(
+                "[bold yellow]Enter the name of the file (without extension)[/]: ") + extension
+        self.message_panel.create_error_message("Invalid input.")
+        return None
+
+    def ask_compress(self) -> bool:
+        """
+        Returns:
+            bool: True if the user wants the file gzip compressed, or None if the answer was invalid.
+        """
+        compress = self.console.input("[bold yellow]Compress the file with gzip? (y/n)[/]: ").lower().strip()
+        if compress not in ("y", "n"):
             self.message_panel.create_error_message("Invalid input.")
+            return None
+        return compress == "y"
+
+    def save_to_csv(self) -> None:
+        """
+        Save the current table data to a CSV file, optionally gzip compressed.
+
+        Rows are written a chunk at a time straight from the table, so a table read lazily
+        from the database is streamed page by page rather than loaded in full.
+        """
+        file_name = self.ask_file_name(self.name, ".csv")
+        if file_name is None:
             return
+        compress = self.ask_compress()
+        if compress is None:
+            return
+        if compress:
+            file_name += ".gz"
 
         # Write table data to the CSV file
         try:
-            with open(file_name, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-
-                # Write header row (columns)
-                if self.table_data["columns"]:
-                    writer.writerow(self.table_data["columns"])
-
-                # Write data rows
-                for row in self.table_data["rows"]:
-                    writer.writerow([row.get(column, "") for column in self.table_data["columns"]])
+            column_names = [column["name"] for column in self.table_data["columns"]]
+            with open_export_file(file_name, compress) as csvfile:
+                write_csv(csvfile, column_names, self.table_data["rows"].iter_values(column_names),
+                          self.settings.get_save_chunk_size())
 
             self.table_saved = True
             self.message_panel.create_information_message(
@@ -281,6 +449,46 @@ class TableBuilder:
         except Exception as e:
             self.message_panel.create_error_message(f"Failed to save file: {e}")
 
+    def export_table_to_csv(self) -> None:
+        """
+        Export a table from the connected database to a CSV file, optionally gzip compressed,
+        without loading it.
+
+        Rows are read from a cursor with fetchmany and written a chunk at a time, so memory
+        use stays the same however large the table is. The table being edited is not touched.
+        """
+        if not self.ensure_connected_database():
+            return
+
+        table_name = self.database.select_table("Enter the number of the table to export")
+        if table_name is None:
+            return
+        file_name = self.ask_file_name(table_name, ".csv")
+        if file_name is None:
+            return
+        compress = self.ask_compress()
+        if compress is None:
+            return
+        if compress:
+            file_name += ".gz"
+
+        try:
+            columns = self.get_table_columns(table_name)
+            chunk_size = self.settings.get_save_chunk_size()
+            rows = fetch_table_rows(self.database.connection, table_name, columns, chunk_size)
+            start = time.perf_counter()
+            with open_export_file(file_name, compress) as csvfile, \
+                    tqdm(total=self.database.get_row_count(table_name), unit=" rows", desc="Exporting") as progress:
+                written = write_csv(csvfile, [column["name"] for column in columns], rows, chunk_size, progress.update)
+            seconds = time.perf_counter() - start
+
+            self.message_panel.create_information_message(
+                f"Exported [bold cyan]{written}[/] rows of '[bold cyan]{table_name}[/]' to '[bold red]{file_name}[/]' "
+                f"in [bold cyan]{seconds:.2f}[/] seconds ([bold cyan]{os.path.getsize(file_name):,}[/] bytes)."
+            )
+        except Exception as e:
+            self.message_panel.create_error_message(f"Failed to export table: {e}")
+
     def name_table(self) -> str:
         self.table_saved = False
         return self.console.input("[bold yellow]Enter a name for the new table[/]: ")
@@ -300,17 +508,235 @@ class TableBuilder:
             return
         
         with open(file_name, 'w') as f:
-            json.dump(self.table_data, f, indent=4)
+            json.dump({"columns": self.table_data["columns"], "rows": list(self.table_data["rows"])}, f, indent=4)
 
             self.table_saved = True
             self.message_panel.create_information_message(
                 f"Table data successfully saved to '[bold red]{file_name}[/]'."
             )
 
-            
+    def save_to_ndjson(self):
+        """
+        Save the table data to a line-delimited JSON file, optionally gzip compressed.
+
+        The file has a header line with the columns and their types, then one compact line
+        per row, written a chunk at a time so the whole document is never built in memory.
+        """
+        file_name = self.ask_file_name(self.name, NDJSON_EXTENSION)
+        if file_name is None:
+            return
+        compress = self.ask_compress()
+        if compress is None:
+            return
+        if compress:
+            file_name += ".gz"
+
+        try:
+            columns = self.table_data["columns"]
+            column_names = [column["name"] for column in columns]
+            with open_export_file(file_name, compress) as f:
+                write_ndjson(f, columns, self.table_data["rows"].iter_values(column_names),
+                             self.settings.get_save_chunk_size())
+
+            self.table_saved = True
+            self.message_panel.create_information_message(
+                f"Table data successfully saved to '[bold red]{file_name}[/]'."
+            )
+        except Exception as e:
+            self.message_panel.create_error_message(f"Failed to save file: {e}")
+
+    def load_ndjson(self, path: str = None) -> None:
+        """
+        Load a line-delimited JSON file saved with save ndjson and update the table data.
+
+        The rows are read a chunk at a time straight into the columns of the table, keeping
+        the column types from the file's header line.
+
+        Args:
+            path (str): Path to the NDJSON file. If not provided, prompts the user.
+        """
+        json_path = path or self.console.input("[bold yellow]Enter path to NDJSON file[/]: ").strip()
+
+        if not os.path.isfile(json_path):
+            self.message_panel.create_error_message("Invalid path or file does not exist.")
+            return
+
+        try:
+            with NdjsonStream(json_path, self.settings.get_save_chunk_size()) as stream:
+                if stream.columns is None:
+                    self.message_panel.create_error_message("NDJSON file is empty.")
+                    return
+
+                columns = stream.columns
+                data = [[] for _ in columns]
+                with create_csv_progress(self.console) as progress:
+                    task = progress.add_task(f"Loading {os.path.basename(json_path)}", total=stream.size)
+                    for chunk in stream.chunks():
+                        for values, chunk_values in zip(data, zip(*chunk)):
+                            values.extend(chunk_values)
+                        progress.update(task, completed=stream.position())
+
+            self.table_data["columns"] = columns
+            self.table_data["rows"] = ColumnStore(columns, {column["name"]: values for column, values in zip(columns, data)})
+            self.change_tracker.reset()
+            self.view_start = self.view_first_column = 0
+            self.render_cache.reset()
+
+            self.table_saved = False
+            self.message_panel.create_information_message("NDJSON file loaded successfully.")
+
+            if self.settings.get_autoprint_table() == "on":
+                self.print_table()
+
+        except UnicodeDecodeError:
+            self.message_panel.create_error_message("Failed to decode file. Ensure it is UTF-8 encoded.")
+        except Exception as e:
+            self.message_panel.create_error_message(f"Failed to load NDJSON file: {e}")
+
+    def export_all(self) -> None:
+        """
+        Save the table as CSV, NDJSON and PDF at once, reading its rows a single time.
+
+        Each chunk of rows is handed to every format. The PDF, which takes longest to lay
+        out, is written on a background thread so the CSV and NDJSON files are not held up
+        by it. A summary of the rows, time, speed and file size of each format is shown at
+        the end.
+        """
+        if not self.table_data["columns"]:
+            self.message_panel.create_error_message("No columns defined. Add columns before exporting.")
+            return
+
+        base_name = self.ask_file_name(self.name, "")
+        if base_name is None:
+            return
+        compress = self.ask_compress()
+        if compress is None:
+            return
+        suffix = ".gz" if compress else ""
+
+        sinks = [
+            CsvSink(f"{base_name}.csv{suffix}", compress),
+            NdjsonSink(f"{base_name}{NDJSON_EXTENSION}{suffix}", compress),
+            BackgroundSink(PdfSink(f"{base_name}.pdf")),
+        ]
+        try:
+            columns = self.table_data["columns"]
+            rows = self.table_data["rows"]
+            start = time.perf_counter()
+            with tqdm(rows.iter_values([column["name"] for column in columns]), total=len(rows),
+                      unit=" rows", desc="Exporting") as values:
+                results = export_rows(values, columns, self.name, len(rows), sinks, self.settings.get_save_chunk_size())
+            seconds = time.perf_counter() - start
+
+            self.table_saved = True
+            self.console.print(self.build_export_summary(results, seconds))
+        except Exception as e:
+            self.message_panel.create_error_message(f"Failed to export table: {e}")
+
+    @staticmethod
+    def build_export_summary(results: list, seconds: float) -> Table:
+        """
+        Build a table summarizing an export to several formats, with a row per format.
+
+        Args:
+            results (list): The ExportResult of each format.
+            seconds (float): How long the whole export took.
+
+        Returns:
+            Table: The summary table.
+        """
+        summary = Table(title="Export", show_lines=False)
+        summary.add_column("Format")
+        summary.add_column("File")
+        summary.add_column("Rows", justify="right")
+        summary.add_column("Write (s)", justify="right")
+        summary.add_column("Rows/s", justify="right")
+        summary.add_column("Bytes", justify="right")
+
+        for result in results:
+            summary.add_row(
+                result.format, escape(result.path), f"{result.rows:,}", f"{result.seconds:.2f}",
+                f"{result.rows_per_second:,.0f}", f"{result.size:,}"
+            )
+
+        summary.add_row(
+            "[bold]Total[/]", "", "", f"[bold]{seconds:.2f}[/]", "",
+            f"[bold]{sum(result.size for result in results):,}[/]"
+        )
+        return summary
+
+    def save_snapshot(self) -> None:
+        """
+        Save the table to a snapshot file, a binary copy of its columns that opens instantly.
+        """
+        if not self.table_data["columns"]:
+            self.message_panel.create_error_message("No columns defined. Add columns before saving.")
+            return
+
+        file_name = self.ask_file_name(self.name, SNAPSHOT_EXTENSION)
+        if file_name is None:
+            return
+
+        try:
+            self.ensure_rows_in_memory()
+            start = time.perf_counter()
+            size = save_snapshot(file_name, self.name, self.table_data["columns"], self.table_data["rows"])
+            seconds = time.perf_counter() - start
+
+            self.table_saved = True
+            self.message_panel.create_information_message(
+                f"Table data successfully saved to '[bold red]{file_name}[/]' "
+                f"([bold cyan]{size:,}[/] bytes in [bold cyan]{seconds:.2f}[/] seconds)."
+            )
+        except Exception as e:
+            self.message_panel.create_error_message(f"Failed to save snapshot: {e}")
+
+    def load_snapshot(self, path: str = None) -> None:
+        """
+        Open a table from a snapshot file.
+
+        The file is mapped into memory rather than read, so opening it takes about the same
+        time however large the table is, and only the rows that are shown or changed are
+        read from disk.
+
+        Args:
+            path (str): Path to the snapshot file. If not provided, prompts the user.
+        """
+        snapshot_path = path or self.console.input("[bold yellow]Enter path to snapshot file[/]: ").strip()
+
+        if not os.path.isfile(snapshot_path):
+            self.message_panel.create_error_message("Invalid path or file does not exist.")
+            return
+
+        try:
+            start = time.perf_counter()
+            snapshot = open_snapshot(snapshot_path)
+            seconds = time.perf_counter() - start
+
+            self.name = snapshot.name
+            self.table_data["columns"] = snapshot.columns
+            self.table_data["rows"] = snapshot.rows
+            # The database table may have changed since the snapshot was taken, so the next
+            # save writes the table in full
+            self.change_tracker.reset()
+            self.view_start = self.view_first_column = 0
+            self.render_cache.reset()
+
+            self.table_saved = True
+            self.message_panel.create_information_message(
+                f"Table '[bold cyan]{snapshot.name}[/]' opened from '[bold red]{snapshot_path}[/]' "
+                f"with [bold cyan]{len(snapshot.rows)}[/] rows in [bold cyan]{seconds * 1000:.1f}[/] ms."
+            )
+
+            if self.settings.get_autoprint_table() == "on":
+                self.print_table()
+        except Exception as e:
+            self.message_panel.create_error_message(f"Failed to load snapshot: {e}")
+
     def load_csv(self, path: str = None) -> None:
         """
-        Load a CSV file and update the table data with all columns defaulting to strings.
+        Load a CSV file and update the table data. Column types are inferred from a sample of
+        the rows when the infer_csv_types setting is on; otherwise all columns default to strings.
 
         Args:
             path (str): Path to the CSV file. If not provided, prompts the user.
@@ -324,23 +750,36 @@ class TableBuilder:
             return
 
         try:
-            with open(csv_path, 'r', encoding='utf-8') as csv_file:
-                reader = csv.reader(csv_file)
-                rows = list(reader)  # Convert CSV reader to a list of rows
-
+            with CsvStream(csv_path, self.settings.get_save_chunk_size()) as stream:
                 # Ensure the CSV is not empty
-                if not rows:
+                if stream.header is None:
                     self.message_panel.create_error_message("CSV file is empty.")
                     return
 
                 # Use the first row as column names, defaulting to string type
-                self.table_data["columns"] = [{"name": col, "type": "str"} for col in rows[0]]
-
-                # Populate the rows with column-value dictionaries
-                self.table_data["rows"] = [
-                    {col: value for col, value in zip([c["name"] for c in self.table_data["columns"]], row)}
-                    for row in rows[1:]
-                ]
+                columns = [{"name": col, "type": "str"} for col in stream.header]
+
+                # Read the values column by column in a single pass over the file, sampling
+                # the rows for type inference
+                data = [[] for _ in columns]
+                sampler = RowSampler()
+                with create_csv_progress(self.console) as progress:
+                    task = progress.add_task(f"Loading {os.path.basename(csv_path)}", total=stream.size)
+                    for chunk in stream.chunks():
+                        for row in chunk:
+                            sampler.add(row)
+                        for values, chunk_values in zip(data, zip(*chunk)):
+                            values.extend(chunk_values)
+                        progress.update(task, completed=stream.position())
+
+                if self.settings.get_infer_csv_types() == "on":
+                    self.apply_inferred_types(columns, data, infer_column_types(sampler.rows(), len(columns)))
+
+                self.table_data["columns"] = columns
+                self.table_data["rows"] = ColumnStore(columns, {column["name"]: values for column, values in zip(columns, data)})
+                self.change_tracker.reset()
+                self.view_start = self.view_first_column = 0
+                self.render_cache.reset()
 
                 # Mark the table as unsaved and notify the user
                 self.table_saved = False
@@ -357,10 +796,164 @@ class TableBuilder:
 
 
             
+    @staticmethod
+    def apply_inferred_types(columns: list, data: list, inferred_types: list) -> None:
+        """
+        Convert the loaded string values of each column to its inferred type, one column at a time.
+
+        The types were guessed from a sample, so each column is first checked against all of
+        its values and falls back to a wider type (int to float, anything to str) if some
+        value does not fit.
+
+        Args:
+            columns (list): The columns, whose types are updated.
+            data (list): The values of each column, converted in place.
+            inferred_types (list): The type guessed for each column.
+        """
+        for index, (column, data_type) in enumerate(zip(columns, inferred_types)):
+            if data_type != "str":
+                data_type = fit_type(data[index], data_type)
+            if data_type != "str":
+                data[index] = [convert_value(value, data_type) for value in data[index]]
+            column["type"] = data_type
+
+    def import_csv_to_database(self, path: str = None) -> None:
+        """
+        Stream a CSV file straight into a table in the connected database, without loading it into memory.
+
+        The rows are read and written one chunk at a time, so memory use stays the same no
+        matter how large the file is. Column types are inferred from the first chunk when
+        the infer_csv_types setting is on; otherwise all columns default to strings. If a
+        later chunk holds a value that does not fit its column's type, the rows written so
+        far are rolled back and the file is imported again with types every value fits.
+
+        Args:
+            path (str): Path to the CSV file. If not provided, prompts the user.
+        """
+        if not self.ensure_connected_database():
+            return
+
+        csv_path = path or self.console.input("[bold yellow]Enter path to CSV file[/]: ").strip()
+        if not os.path.isfile(csv_path):
+            self.message_panel.create_error_message("Invalid path or file does not exist.")
+            return
+
+        default_name = os.path.splitext(os.path.basename(csv_path))[0]
+        table_name = self.console.input(
+            f"[bold yellow]Enter the name of the database table (leave blank for '[bold cyan]{default_name}[/]')[/]: "
+        ).strip() or default_name
+
+        try:
+            column_types = None
+            while True:
+                with CsvStream(csv_path, self.settings.get_save_chunk_size()) as stream:
+                    if stream.header is None:
+                        self.message_panel.create_error_message("CSV file is empty.")
+                        return
+
+                    chunks = stream.chunks()
+                    first_chunk = next(chunks, [])
+                    if column_types is None:
+                        # Guess the column types from the first chunk of rows
+                        if self.settings.get_infer_csv_types() == "on":
+                            column_types = infer_column_types(first_chunk, len(stream.header))
+                        else:
+                            column_types = ["str"] * len(stream.header)
+
+                    columns = [{"name": col, "type": data_type} for col, data_type in zip(stream.header, column_types)]
+                    rebuild_index = self.prepare_import_table(table_name, columns)
+
+                    statement = build_insert_statement(table_name, stream.header)
+                    with create_csv_progress(self.console) as progress:
+                        task = progress.add_task(f"Importing {os.path.basename(csv_path)}", total=stream.size)
+
+                        def rows():
+                            for converted in convert_chunks(chain([first_chunk], chunks), column_types):
+                                yield from converted
+                                progress.update(task, completed=stream.position())
+
+                        try:
+                            stats = bulk_insert(self.database.connection, statement, rows(),
+                                                self.settings.get_save_chunk_size(), atomic=True)
+                        except ColumnTypesChanged as e:
+                            # Everything written so far was rolled back, so start over
+                            column_types = e.column_types
+                            continue
+                break
+
+            self.forget_stored_table(table_name)
+            if rebuild_index:
+                SearchIndex(self.database.connection).build(table_name)
+            else:
+                SearchIndex(self.database.connection).sync(table_name)
+            self.message_panel.create_information_message(
+                f"Imported [bold cyan]{stats.rows}[/] rows from '[bold red]{csv_path}[/]' into table '[bold cyan]{table_name}[/]' "
+                f"in {stats.seconds:.2f}s ([bold cyan]{stats.rows_per_second:,.0f}[/] rows/s)."
+            )
+        except UnicodeDecodeError:
+            self.message_panel.create_error_message("Failed to decode file. Ensure it is UTF-8 encoded.")
+        except Exception as e:
+            self.message_panel.create_error_message(f"Failed to import CSV file: {e}")
+        finally:
+            # A failed import must not leave the changes to the old table open
+            if self.database.connection.in_transaction:
+                self.database.connection.rollback()
+
+    def prepare_import_table(self, table_name: str, columns: list) -> bool:
+        """
+        Make an empty table with the given columns for an import to fill.
+
+        The changes are made in a transaction that the import commits along with its rows,
+        so a failed import leaves the old table as it was. An existing table with the same
+        columns is emptied; one with other columns is dropped and created again, so it
+        takes the columns of the file.
+
+        Args:
+            table_name (str): The table in the connected database.
+            columns (list): The columns, with program types.
+
+        Returns:
+            bool: True if the table had a search index that was dropped with it and has to be built again.
+        """
+        connection = self.database.connection
+        quoted_table_name = quote_identifier(table_name)
+        if not connection.in_transaction:
+            connection.execute("BEGIN")
+
+        if table_name in self.database.get_tables() and self.get_table_columns(table_name) == columns:
+            connection.execute(f"DELETE FROM {quoted_table_name}")
+            return False
+
+        search_index = SearchIndex(connection)
+        had_index = search_index.exists(table_name)
+        search_index.drop_objects(table_name)
+        connection.execute(f"DROP TABLE IF EXISTS {quoted_table_name}")
+        connection.execute(f"CREATE TABLE {quoted_table_name} ({self.get_columns_definition(columns)})")
+        return had_index
+
     def load_batch_csv(self):
         """
-        Load a batch of CSV files in a specified directory into the database with all columns defaulting to strings.
+        Load a batch of CSV files in a specified directory into the database, one table per file.
+
+        An import manifest in the database remembers which table each file went into and
+        what the file looked like then. Files that are unchanged since their last import are
+        skipped, so re-running a batch, or resuming one that was interrupted, only imports
+        new and modified files. Each file keeps the same table across runs.
+
+        Each file is first written to a staging table. Only once the whole file is in does
+        the staging table replace the file's table, in the same transaction that records the
+        file in the manifest, so a file that fails or is interrupted leaves its table as it
+        was and is imported again on the next run.
+
+        The files are parsed in parallel on a process pool, and their rows are sent a chunk at
+        a time to this process, the only one that writes to the database. Column types are
+        inferred from each file's first chunk when the infer_csv_types setting is on, and a
+        file is sent again with wider types if a later chunk does not fit them. The table
+        being built is left untouched.
         """
+        if not self.ensure_connected_database():
+            return
+
         directory = self.console.input("[bold yellow]Enter the directory of CSV files[/]: ").strip()
 
         # Validate the directory path
@@ -369,17 +962,10 @@ class TableBuilder:
             return
 
         recursive_load = self.console.input("[bold yellow]Load CSV files from subdirectories? (y/n)[/]: ").strip().lower()
-        csv_files = []
-
-        # Collect CSV files based on user input
-        if recursive_load == 'y':
-            for root, dirs, files in os.walk(directory):
-                csv_files.extend([os.path.join(root, file) for file in files if file.endswith('.csv')])
-        elif recursive_load == 'n':
-            csv_files = [os.path.join(directory, file) for file in os.listdir(directory) if file.endswith('.csv')]
-        else:
+        if recursive_load not in ('y', 'n'):
             self.message_panel.create_error_message("Invalid input! Please enter 'y' or 'n'.")
             return
+        csv_files = find_csv_files(directory, recursive_load == 'y')
 
         # Notify the user about found CSV files
         if not csv_files:
@@ -388,22 +974,173 @@ class TableBuilder:
 
         self.message_panel.create_information_message(f"Found [bold cyan]{len(csv_files)}[/] CSV files.")
 
-        # Process each CSV file
-        for i, file in enumerate(csv_files):
-            try:
-                self.load_csv(path=file)
+        # Skip the files that are unchanged since they were last imported into this database
+        connection = self.database.connection
+        try:
+            manifest = ImportManifest(connection)
+            manifest.drop_staging_tables()
+            entries, unchanged = manifest.plan(csv_files)
+        except (sqlite3.Error, OSError) as e:
+            self.message_panel.create_error_message(f"Failed to read the import manifest: {e}")
+            return
+
+        results = [
+            {"entry": entry, "file": entry.path, "table": entry.table_name, "size": entry.size,
+             "rows": entry.rows if entry.path in unchanged else 0, "read": 0, "parse_seconds": 0.0,
+             "write_seconds": 0.0, "statement": None, "error": None, "unchanged": entry.path in unchanged}
+            for entry in entries
+        ]
+        pending = [result for result in results if not result["unchanged"]]
+        if len(pending) < len(results):
+            self.message_panel.create_information_message(
+                f"Skipping [bold cyan]{len(results) - len(pending)}[/] unchanged CSV files."
+            )
+        chunk_size = self.settings.get_save_chunk_size()
+        infer_types = self.settings.get_infer_csv_types() == "on"
 
-                # Assign a unique name for each table
-                self.name = f"Table_{os.path.splitext(os.path.basename(file))[0]}_{i + 1}"
-                self.save_to_database()
-                self.message_panel.create_information_message(f"Successfully loaded table '[bold cyan]{self.name}[/]' from file '[bold red]{file}[/]'.")
-            except Exception as e:
-                self.message_panel.create_error_message(f"Error processing '[bold blue]{file}[/]': {e}")
+        start = time.perf_counter()
+        try:
+            with tqdm(total=sum(result["size"] for result in pending), unit="B", unit_scale=True,
+                      desc="Loading CSV files") as progress:
+                messages = parse_csv_files_parallel([result["file"] for result in pending], chunk_size, infer_types) \
+                    if pending else []
+                for message in messages:
+                    kind, index = message[0], message[1]
+                    result = pending[index]
+                    if result["error"] is not None:
+                        continue
+
+                    try:
+                        if kind == "columns":
+                            # Sent again when the worker starts the file over with wider
+                            # types, so any rows staged so far are dropped
+                            columns = message[2]
+                            staging_table = manifest.staging_table(result["table"])
+                            connection.execute(f"DROP TABLE IF EXISTS {quote_identifier(staging_table)}")
+                            connection.execute(
+                                f"CREATE TABLE {quote_identifier(staging_table)} ({self.get_columns_definition(columns)})"
+                            )
+                            connection.commit()
+                            result["rows"] = 0
+                            result["statement"] = build_insert_statement(staging_table, [col["name"] for col in columns])
+                        elif kind == "rows":
+                            stats = bulk_insert(connection, result["statement"], message[2], chunk_size)
+                            result["rows"] += stats.rows
+                            result["write_seconds"] += stats.seconds
+                            # A file sent again is not counted twice
+                            if message[3] > result["read"]:
+                                progress.update(message[3] - result["read"])
+                                result["read"] = message[3]
+                        elif kind == "done":
+                            result["parse_seconds"] = message[2]
+                            progress.update(result["size"] - result["read"])
+                            self.replace_with_staging_table(manifest, result["entry"]._replace(rows=result["rows"]))
+                        else:
+                            result["error"] = message[2]
+                    except (sqlite3.Error, ValueError) as e:
+                        result["error"] = str(e)
+
+                    if result["error"] is not None:
+                        if connection.in_transaction:
+                            connection.rollback()
+                        try:
+                            with connection:
+                                connection.execute(
+                                    f"DROP TABLE IF EXISTS {quote_identifier(manifest.staging_table(result['table']))}"
+                                )
+                        except sqlite3.Error:
+                            pass  # Dropped at the start of the next batch instead
+                        progress.update(result["size"] - result["read"])
+                        self.message_panel.create_error_message(
+                            f"Error processing '[bold blue]{result['file']}[/]': {result['error']}"
+                        )
+        except Exception as e:
+            self.message_panel.create_error_message(f"Batch CSV loading stopped: {e}")
 
-        self.table_saved = True
+        self.console.print(self.build_batch_summary(results, time.perf_counter() - start))
         self.message_panel.create_information_message("Batch CSV loading complete!")
 
+    def replace_with_staging_table(self, manifest: ImportManifest, entry) -> None:
+        """
+        Replace a file's table with the staging table it was imported into, and record the
+        file in the import manifest, in one transaction.
 
+        The table's search index, if it had one, is rebuilt for the new rows.
+
+        Args:
+            manifest (ImportManifest): The manifest of the connected database.
+            entry (ManifestEntry): The imported file, with its table and row count.
+        """
+        connection = self.database.connection
+        search_index = SearchIndex(connection)
+        had_index = search_index.exists(entry.table_name)
+
+        if not connection.in_transaction:
+            connection.execute("BEGIN")
+        search_index.drop_objects(entry.table_name)
+        connection.execute(f"DROP TABLE IF EXISTS {quote_identifier(entry.table_name)}")
+        connection.execute(
+            f"ALTER TABLE {quote_identifier(manifest.staging_table(entry.table_name))} "
+            f"RENAME TO {quote_identifier(entry.table_name)}"
+        )
+        manifest.record(entry)  # Commits
+        self.forget_stored_table(entry.table_name)
+
+        if had_index:
+            search_index.build(entry.table_name)
+
+    @staticmethod
+    def build_batch_summary(results: list, seconds: float) -> Table:
+        """
+        Build a table summarizing a batch CSV load, with a row per file and a total.
+
+        Args:
+            results (list): What happened to each file, as built by load_batch_csv.
+            seconds (float): How long the whole batch took.
+
+        Returns:
+            Table: The summary table.
+        """
+        summary = Table(title="Batch CSV loading", show_lines=False)
+        summary.add_column("File")
+        summary.add_column("Table")
+        summary.add_column("Rows", justify="right")
+        summary.add_column("Bytes", justify="right")
+        summary.add_column("Parse (s)", justify="right")
+        summary.add_column("Write (s)", justify="right")
+        summary.add_column("Status")
+
+        for result in results:
+            if result["unchanged"]:
+                status = "[bold yellow]unchanged[/]"
+            elif result["error"] is None:
+                status = "[bold green]ok[/]"
+            else:
+                status = f"[bold red]{escape(result['error'])}[/]"
+            summary.add_row(
+                escape(result["file"]), escape(result["table"]), f"{result['rows']:,}", f"{result['size']:,}",
+                f"{result['parse_seconds']:.2f}", f"{result['write_seconds']:.2f}", status
+            )
+
+        # Only count the files that were imported this time
+        imported = [result for result in results if not result["unchanged"]]
+        total_rows = sum(result["rows"] for result in imported)
+        summary.add_row(
+            "[bold]Total imported[/]", "", f"[bold]{total_rows:,}[/]", f"[bold]{sum(result['size'] for result in imported):,}[/]",
+            "", "", f"[bold]{seconds:.2f}s[/] at {total_rows / seconds if seconds > 0 else total_rows:,.0f} rows/s"
+        )
+        return summary
+
+    def ensure_rows_in_memory(self) -> None:
+        """
+        Read every row of a lazily loaded table into memory, for changes that touch every row.
+        """
+        rows = self.table_data["rows"]
+        if isinstance(rows, LazyRows):
+            self.message_panel.create_information_message(
+                f"Loading all [bold cyan]{len(rows)}[/] rows of '[bold cyan]{rows.table}[/]' into memory."
+            )
+            self.table_data["rows"] = rows.materialize()
 
     def get_num_columns(self) -> int:
         """
@@ -447,10 +1184,10 @@ class TableBuilder:
             return
 
         # Add the column with the selected type
+        self.ensure_rows_in_memory()
         self.table_data["columns"].append({"name": column_name, "type": selected_type})
-        # Add empty values for the new column to existing rows
-        for row in self.table_data["rows"]:
-            row[column_name] = ""
+        # Start the new column with empty cells in the existing rows
+        self.table_data["rows"].add_column(column_name, selected_type)
         self.table_saved = False
         self.message_panel.create_information_message(
             f"Column '[bold cyan]{column_name}[/]' added with type '[bold red]{selected_type}'.[/]"
@@ -543,12 +1280,13 @@ class TableBuilder:
             return
 
         # Apply the name change
+        self.ensure_rows_in_memory()
         old_name = selected_column["name"]
         selected_column["name"] = new_name
 
-        # Update all row data to reflect the name change
-        for row in self.table_data["rows"]:
-            row[new_name] = row.pop(old_name, "")
+        # Update the row data to reflect the name change
+        self.table_data["rows"].rename_column(old_name, new_name)
+        self.render_cache.column_renamed(old_name, new_name)
 
         self.table_saved = False
         self.message_panel.create_information_message(f"Column '[bold cyan]{old_name}[/]' renamed to '[bold green]{new_name}[/]' successfully.")
@@ -562,7 +1300,7 @@ class TableBuilder:
             self.message_panel.create_error_message("No columns defined. Add columns before adding rows.")
             return
 
-        row_data = {}
+        row_data = Row()
         for column in self.table_data["columns"]:
             column_name = column["name"]
             data_type = column["type"]
@@ -593,36 +1331,25 @@ class TableBuilder:
                         self.message_panel.create_error_message("Invalid data. Expected 'true' or 'false'.")
 
         self.table_data["rows"].append(row_data)
+        self.change_tracker.mark_inserted(row_data)
+        self.render_cache.row_added()
         self.table_saved = False
         self.message_panel.create_information_message("Row added with validated data.")
 
 
     def edit_cell(self) -> None:
         """
-        Edits the cell content using direct indexing.
+        Edits the content of a cell, found by its position, its column name or a search.
         """
         if not self.table_data["columns"] or not self.table_data["rows"]:
             self.message_panel.create_error_message("No table data to edit. Add rows and columns first.")
             return
 
-        # Display table cells with their indices
-        self.console.print("[bold green]Table Cells:[/]")
-        for row_idx, row in enumerate(self.table_data["rows"], start=1):
-            row_display = [
-                f"({row_idx},{col_idx + 1}) {row[col['name']]}" for col_idx, col in enumerate(self.table_data["columns"])
-            ]
-            self.console.print(f"Row {row_idx}: " + " | ".join(row_display))
-
         try:
-            # Prompt for cell index
-            cell_position = self.console.input("[bold yellow]Enter cell position as 'row,column' (e.g., 1,2)[/]: ").strip()
-            row_idx, col_idx = map(int, cell_position.split(","))
-            row_idx -= 1  # Convert to 0-based index
-            col_idx -= 1  # Convert to 0-based index
-
-            if not (0 <= row_idx < len(self.table_data["rows"]) and 0 <= col_idx < len(self.table_data["columns"])):
-                self.message_panel.create_error_message("Invalid cell position.")
+            cell = self.locate_cell()
+            if cell is None:
                 return
+            row_idx, col_idx = cell
 
             # Fetch column and its type
             column = self.table_data["columns"][col_idx]
@@ -654,25 +1381,239 @@ class TableBuilder:
                     self.message_panel.create_error_message(f"Unsupported data type: [bold cyan]{column_type}[/]")
 
             # Update the cell
-            self.table_data["rows"][row_idx][column_name] = new_value
+            row = self.table_data["rows"].set_cell(row_idx, column_name, new_value)
+            self.change_tracker.mark_updated(row)
+            self.render_cache.cell_changed(row_idx, column_name)
             self.table_saved = False
             self.message_panel.create_information_message("Cell updated successfully.")
 
-        except ValueError:
-            self.message_panel.create_error_message("Invalid input format. Use 'row,column'.")
         except Exception as e:
             self.message_panel.create_error_message(f"Failed to edit cell: {e}")
 
+    def locate_cell(self) -> tuple:
+        """
+        Ask for a cell until one is chosen, showing only the rows asked for along the way.
+
+        The user can enter 'row,column' to pick a cell, with the column given by number or
+        name, a row or a range of rows such as '10-20' to look at them first, or 'find' and
+        some text to list the rows that contain it. Once a cell is picked, the rows around
+        it are shown. Nothing here prints the whole table, so finding a cell costs the same
+        however large the table is.
+
+        Returns:
+            tuple: The 0-based row and column indices of the cell, or None if the user gave up.
+        """
+        row_count = self.get_num_rows()
+        columns = self.table_data["columns"]
+        self.console.print(
+            f"[bold green]Columns:[/] "
+            + ", ".join(f"{idx}. {escape(column['name'])}" for idx, column in enumerate(columns, start=1))
+        )
+        self.console.print(
+            f"[bold green]Rows:[/] 1-{row_count}. Enter 'row,column' to pick a cell, a row or range such "
+            "as '10-20' to view rows, 'find <text>' to search, or nothing to cancel."
+        )
+
+        while True:
+            entry = self.console.input("[bold yellow]Enter cell position, rows or search[/]: ").strip()
+            if not entry:
+                self.message_panel.create_information_message("Edit cancelled.")
+                return None
+
+            if entry.lower().startswith("find "):
+                self.show_rows_containing(entry[5:].strip())
+                continue
+
+            if "," in entry:
+                row_text, column_text = (part.strip() for part in entry.split(",", 1))
+                row_idx = self.parse_row_number(row_text)
+                col_idx = self.parse_column(column_text)
+                if row_idx is None:
+                    self.message_panel.create_error_message(f"Invalid row. Enter a number from 1 to {row_count}.")
+                elif col_idx is None:
+                    self.message_panel.create_error_message("Invalid column. Enter its number or name.")
+                else:
+                    self.print_rows(max(0, row_idx - EDIT_CONTEXT_ROWS), row_idx + EDIT_CONTEXT_ROWS + 1)
+                    return row_idx, col_idx
+                continue
+
+            start_text, _, stop_text = entry.partition("-")
+            start = self.parse_row_number(start_text.strip())
+            stop = start
+            if stop_text:
+                # A range that runs past the end stops at the last row
+                stop = min(int(stop_text), row_count) - 1 if stop_text.strip().isdigit() else None
+            if start is None or stop is None or stop < start:
+                self.message_panel.create_error_message("Invalid input format. Use 'row,column', a row range or 'find <text>'.")
+                continue
+            page_size = self.settings.get_table_page_size()
+            if stop - start + 1 > page_size:
+                self.message_panel.create_information_message(f"Showing the first [bold cyan]{page_size}[/] rows of the range.")
+                stop = start + page_size - 1
+            self.print_rows(start, stop + 1)
+
+    def parse_row_number(self, text: str) -> int:
+        """
+        Returns:
+            int: The 0-based index of a 1-based row number, or None if it is not a row of the table.
+        """
+        try:
+            row_idx = int(text) - 1
+        except ValueError:
+            return None
+        return row_idx if 0 <= row_idx < self.get_num_rows() else None
+
+    def parse_column(self, text: str) -> int:
+        """
+        Returns:
+            int: The index of a column given by its 1-based number or its name, or None if there is no such column.
+        """
+        columns = self.table_data["columns"]
+        if text.isdigit():
+            col_idx = int(text) - 1
+            return col_idx if 0 <= col_idx < len(columns) else None
+        for matches in (lambda name: name == text, lambda name: name.lower() == text.lower()):
+            col_idx = next((idx for idx, column in enumerate(columns) if matches(column["name"])), None)
+            if col_idx is not None:
+                return col_idx
+        return None
+
+    def show_rows_containing(self, text: str) -> None:
+        """
+        Show the first rows with a cell that contains some text, ignoring case.
+
+        The search stops once search_result_limit rows are found, so finding a row near
+        the top of a large table is quick.
+        """
+        if not text:
+            self.message_panel.create_error_message("Enter some text to find.")
+            return
+        needle = text.lower()
+        limit = self.settings.get_search_result_limit()
+        column_names = [column["name"] for column in self.table_data["columns"]]
+        values = self.table_data["rows"].iter_values(column_names)
+        positions = list(islice(
+            (index for index, row in enumerate(values) if any(needle in str(value).lower() for value in row)),
+            limit + 1
+        ))
+        if not positions:
+            self.message_panel.create_information_message("No rows contain that text.")
+            return
+        self.console.print(self.build_rows_table(f"{self.name} rows containing {escape(text)}", positions[:limit]))
+        if len(positions) > limit:
+            self.message_panel.create_information_message(f"Showing the first [bold cyan]{limit}[/] matching rows.")
+
+
+    def select_column(self, prompt: str) -> dict:
+        """
+        Show the columns and ask the user to pick one.
+
+        Args:
+            prompt (str): The question to ask.
+
+        Returns:
+            dict: The chosen column, or None if the choice was invalid.
+        """
+        if not self.table_data["columns"]:
+            self.message_panel.create_error_message("No columns defined. Add columns first.")
+            return None
+
+        self.console.print("[bold green]Available Columns:[/]")
+        for idx, column in enumerate(self.table_data["columns"], start=1):
+            self.console.print(f"{idx}. {column['name']} (Type: {column['type']})")
+
+        try:
+            column_number = int(self.console.input(f"[bold yellow]{prompt}[/]: ")) - 1
+        except ValueError:
+            self.message_panel.create_error_message("Invalid input. Please enter a number.")
+            return None
+        if not (0 <= column_number < len(self.table_data["columns"])):
+            self.message_panel.create_error_message("Invalid column number.")
+            return None
+        return self.table_data["columns"][column_number]
+
+    def filter_rows(self) -> None:
+        """
+        Show the rows whose value in a column equals the value entered.
+        """
+        column = self.select_column("Enter the number of the column to filter on")
+        if column is None:
+            return
+
+        text = self.console.input(f"[bold yellow]Enter the value to look for in '[bold cyan]{column['name']}[/]'[/]: ").strip()
+        # Match the stored type, so 5 finds the integer 5 and an empty value finds empty cells
+        value = convert_value(text, column["type"]) if value_fits(text, column["type"]) else text
+
+        rows = self.table_data["rows"]
+        positions = rows.find_rows(column["name"], value)
+        if not positions:
+            self.message_panel.create_information_message("No matching rows.")
+            return
+
+        limit = self.settings.get_search_result_limit()
+        title = f"{self.name} where {escape(column['name'])} = {escape(text)}"
+        self.console.print(self.build_rows_table(title, positions[:limit]))
+
+        message = f"Found [bold cyan]{len(positions)}[/] matching rows."
+        if len(positions) > limit:
+            message += f" Showing the first [bold cyan]{limit}[/]."
+        self.message_panel.create_information_message(message)
+
+    def build_rows_table(self, title: str, positions: list) -> Table:
+        """
+        Build a table of some rows, each shown with its row number.
+
+        Args:
+            title (str): The table title.
+            positions (list): The 0-based indices of the rows.
+
+        Returns:
+            Table: The table of the rows.
+        """
+        rows = self.table_data["rows"]
+        column_names = [col["name"] for col in self.table_data["columns"]]
+        table = Table(title=title, border_style="yellow", show_lines=True)
+        table.add_column("Row", style="bold cyan", justify="right")
+        for name in column_names:
+            table.add_column(escape(name), style="cyan")
+        for position in positions:
+            row = rows[position]
+            table.add_row(str(position + 1), *(escape(str(row.get(name))) for name in column_names), style="magenta")
+        return table
+
+    def count_values(self) -> None:
+        """
+        Show how many rows hold each distinct value of a column, most common first.
+        """
+        column = self.select_column("Enter the number of the column to count")
+        if column is None:
+            return
+
+        counts = self.table_data["rows"].count_values(column["name"])
+        limit = self.settings.get_search_result_limit()
+        table = Table(title=f"Values of {escape(column['name'])}", border_style="yellow")
+        table.add_column("Value", style="cyan")
+        table.add_column("Rows", style="magenta", justify="right")
+        for value, count in counts.most_common(limit):
+            table.add_row(escape(str(value)), f"{count:,}")
+        self.console.print(table)
+
+        message = f"[bold cyan]{len(counts)}[/] distinct values."
+        if len(counts) > limit:
+            message += f" Showing the [bold cyan]{limit}[/] most common."
+        self.message_panel.create_information_message(message)
 
     def remove_column(self) -> None:
         """
         Removes a column based on the column name given.
         """
         column_name = self.console.input("[bold yellow]Enter column name to remove[/]: ")
-        if column_name in self.table_data["columns"]:
-            self.table_data["columns"].remove(column_name)
-            for row in self.table_data["rows"]:
-                row.pop(column_name, None)
+        column = next((col for col in self.table_data["columns"] if col["name"] == column_name), None)
+        if column is not None:
+            self.ensure_rows_in_memory()
+            self.table_data["columns"].remove(column)
+            self.table_data["rows"].remove_column(column_name)
+            self.render_cache.column_removed(column_name)
             self.table_saved = False
             self.message_panel.create_information_message("Column removed.")
         else:
@@ -684,7 +1625,9 @@ class TableBuilder:
         """
         row_number = int(self.console.input("[bold yellow]Enter row number to remove (1-based index)[/]: ")) - 1
         if 0 <= row_number < len(self.table_data["rows"]):
-            self.table_data["rows"].pop(row_number)
+            row = self.table_data["rows"].pop(row_number)
+            self.change_tracker.mark_deleted(row)
+            self.render_cache.row_removed(row_number)
             self.table_saved = False
             self.message_panel.create_information_message("Row removed.")
         else:
@@ -699,8 +1642,7 @@ class TableBuilder:
 
         try:
             # Get the list of available tables
-            self.database.cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in self.database.cursor.fetchall()]
+            tables = self.database.get_tables()
 
             if not tables:
                 self.message_panel.create_error_message("[bold yellow]No tables found in the database.[/]")
@@ -723,8 +1665,10 @@ class TableBuilder:
                 confirm = self.console.input(f"[bold red]Are you sure you want to delete table '[bold cyan]{table_name}[/]'? (y/n)[/]: ").lower().strip()
                 if confirm == 'y':
                     # Execute deletion
+                    SearchIndex(self.database.connection).drop(table_name)
                     self.database.cursor.execute(f"DROP TABLE {quoted_table_name}")
                     self.database.connection.commit()
+                    self.forget_stored_table(table_name)
                     self.message_panel.create_information_message(f"Table '[bold cyan]{table_name}[/]' has been deleted successfully.")
                 else:
                     self.message_panel.create_information_message("[bold yellow]Table deletion cancelled.[/]")
@@ -734,40 +1678,218 @@ class TableBuilder:
             self.message_panel.create_error_message(f"[bold red]Failed to delete table: {e}[/]")
 
 
-    def build_table(self) -> Table:
+    def build_table(self, start: int = 0, stop: int = None, first_column: int = 0, last_column: int = None) -> Table:
         """
         Takes the current table data and builds the table with it.
 
+        Only the rows and columns in the given window are added, so a page of a large table
+        takes as long to build as a small table. When the window does not cover the whole
+        table, each row is shown with its row number. Cell text comes from the render cache,
+        so only cells that changed since the last print are formatted again, and it is added
+        as plain text so it is not parsed for markup.
+
+        Args:
+            start (int): The first row to show.
+            stop (int): The row to stop before, or None to show every row from start.
+            first_column (int): The first column to show.
+            last_column (int): The column to stop before, or None to show every column from first_column.
+
         Returns:
-            Table: The rendered table with all of the data.
+            Table: The rendered table with the data in the window.
         """
         if not self.table_data["columns"]:
             self.message_panel.create_error_message("No columns defined. Add columns before building the table.")
             return Table(border_style="yellow", show_lines=True)
 
+        row_count = self.get_num_rows()
+        stop = row_count if stop is None else min(stop, row_count)
+        columns = self.table_data["columns"][first_column:last_column]
+        windowed = start > 0 or stop < row_count or len(columns) < len(self.table_data["columns"])
+
         # Create a Rich Table instance
         table = Table(title=self.name, border_style="yellow", show_lines=True)
+        if windowed:
+            table.caption = (
+                f"Rows {start + 1 if stop else 0}-{stop} of {row_count}, "
+                f"columns {first_column + 1}-{first_column + len(columns)} of {self.get_num_columns()}"
+            )
+            table.add_column("#", style="bold yellow", justify="right")
+
+        # The widths of whole columns are known from the render cache, which spares rich from
+        # measuring every cell again. They are only used when the table fits the console, as
+        # fixed widths would keep rich from wrapping the widest columns to make it fit.
+        rows = self.table_data["rows"]
+        column_names = [column["name"] for column in columns]
+        widths = [None] * len(columns)
+        if not windowed and len(rows) <= self.render_cache.max_rows:
+            widths = [
+                max(self.render_cache.get_width(rows, column["name"]), text_width(f"{column['name']} ({column['type']})"))
+                for column in columns
+            ]
+            # Each column also takes two cells of padding and one of border, plus the last border
+            if sum(widths) + 3 * len(widths) + 1 > self.console.width:
+                widths = [None] * len(columns)
 
         # Add columns with type information
-        for column in self.table_data["columns"]:
-            column_name = column["name"]
-            column_type = column["type"]
-            table.add_column(f"{column_name} ([bold red]{column_type}[/])", style="cyan")
+        for column, width in zip(columns, widths):
+            header = f"{column['name']} ([bold red]{column['type']}[/])"
+            table.add_column(header, style="cyan", width=width)
 
         # Add rows
-        for row in self.table_data["rows"]:
-            row_values = [str(row.get(column["name"], "")) for column in self.table_data["columns"]]
-            table.add_row(*row_values, style="magenta")
+        window = self.render_cache.get_window(rows, column_names, start, stop)
+        for number, cells in enumerate(zip(*window), start=start + 1):
+            cells = [Text(cell) for cell in cells]
+            if windowed:
+                cells.insert(0, Text(str(number)))
+            table.add_row(*cells, style="magenta")
 
         return table
 
 
     def print_table(self) -> None:
         """
-        Prints the built table to the screen.
+        Prints the built table to the screen, a page at a time if it has more rows than the
+        paged_view_threshold setting.
         """
-        table = self.build_table()
-        self.console.print(table)
+        if self.get_num_rows() > self.settings.get_paged_view_threshold():
+            self.view_table_pages()
+            return
+        self.print_rows()
+
+    def use_plain_renderer(self) -> bool:
+        """
+        Returns:
+            bool: True if the table should be drawn as plain text, following the table_renderer setting.
+        """
+        renderer = self.settings.get_table_renderer()
+        if renderer == "auto":
+            return self.get_num_rows() > self.settings.get_plain_render_threshold()
+        return renderer == "plain"
+
+    def print_rows(self, start: int = 0, stop: int = None, first_column: int = 0, last_column: int = None) -> None:
+        """
+        Print a window of the table with the renderer chosen in the settings.
+
+        Args:
+            start (int): The first row to show.
+            stop (int): The row to stop before, or None to show every row from start.
+            first_column (int): The first column to show.
+            last_column (int): The column to stop before, or None to show every column from first_column.
+        """
+        if self.use_plain_renderer() and self.table_data["columns"]:
+            self.print_plain_table(start, stop, first_column, last_column)
+        else:
+            self.console.print(self.build_table(start, stop, first_column, last_column))
+
+    def print_plain_table(self, start: int = 0, stop: int = None, first_column: int = 0, last_column: int = None) -> None:
+        """
+        Print a window of the table as fixed-width plain text, streaming it line by line.
+
+        Plain text skips the markup parsing and border drawing of a rich table, which is
+        what makes large tables slow to print. Column widths come from the rows being
+        printed, or from a sample of them when there are many.
+
+        Args:
+            start (int): The first row to show.
+            stop (int): The row to stop before, or None to show every row from start.
+            first_column (int): The first column to show.
+            last_column (int): The column to stop before, or None to show every column from first_column.
+        """
+        row_count = self.get_num_rows()
+        stop = row_count if stop is None else min(stop, row_count)
+        columns = self.table_data["columns"][first_column:last_column]
+        column_names = [column["name"] for column in columns]
+        headers = ["#"] + [f"{column['name']} ({column['type']})" for column in columns]
+
+        rows = self.table_data["rows"]
+        if len(rows) <= self.render_cache.max_rows:
+            # Take the cell text, and the widths of whole columns, from the render cache
+            window = self.render_cache.get_window(rows, column_names, start, stop)
+            if start == 0 and stop == row_count:
+                cell_widths = [self.render_cache.get_width(rows, name) for name in column_names]
+            else:
+                cell_widths = [max(map(len, cells), default=0) for cells in window]
+            widths = [
+                min(max(len(header), width), MAX_PLAIN_COLUMN_WIDTH)
+                for header, width in zip(headers, [len(str(stop))] + cell_widths)
+            ]
+            lines = zip(range(start + 1, stop + 1), *window)
+        else:
+            # Too large to cache: size the columns from a sample and stream the rest
+            def numbered_rows(row_start, row_stop):
+                values = rows.iter_values(column_names, row_start, row_stop)
+                return ((number, *row) for number, row in enumerate(values, start=row_start + 1))
+
+            sample = list(numbered_rows(start, min(stop, start + PLAIN_SAMPLE_ROWS)))
+            widths = measure_columns(headers, sample)
+            lines = sample if start + len(sample) >= stop else chain(sample, numbered_rows(start + len(sample), stop))
+
+        self.console.print(
+            f"[bold]{escape(str(self.name))}[/] - rows {start + 1 if stop else 0}-{stop} of {row_count}, "
+            f"columns {first_column + 1}-{first_column + len(columns)} of {self.get_num_columns()}"
+        )
+        write_lines(self.console, render_plain_table(headers, lines, widths, right_aligned=1))
+
+    def get_visible_column_count(self) -> int:
+        """
+        Returns:
+            int: How many columns fit across the console at a readable width.
+        """
+        return max(1, (self.console.width - PAGE_ROW_NUMBER_WIDTH) // MIN_PAGE_COLUMN_WIDTH)
+
+    def view_table_pages(self) -> None:
+        """
+        Show the table one page of rows and columns at a time, moving between pages on command.
+
+        The viewer remembers where it was, so printing the table again after an edit returns
+        to the same page.
+        """
+        page_size = self.settings.get_table_page_size()
+        column_count = self.get_visible_column_count()
+        row_count = self.get_num_rows()
+        total_columns = self.get_num_columns()
+
+        while True:
+            # Keep the window inside the table, which may have shrunk since it was last shown
+            self.view_start = max(0, min(self.view_start, (row_count - 1) // page_size * page_size))
+            self.view_first_column = max(0, min(self.view_first_column, total_columns - 1))
+
+            self.print_rows(
+                self.view_start, self.view_start + page_size,
+                self.view_first_column, self.view_first_column + column_count
+            )
+
+            response = self.console.input(
+                "[bold yellow]Enter for the next page, 'p' previous, 'g <row>' go to a row, "
+                "'>' / '<' more columns, or 'q' to stop[/]: "
+            ).strip().lower()
+
+            if response in ("", "n"):
+                if self.view_start + page_size >= row_count:
+                    self.message_panel.create_information_message("That was the last page.")
+                    return
+                self.view_start += page_size
+            elif response == "p":
+                self.view_start -= page_size
+            elif response.startswith("g"):
+                try:
+                    row_number = int(response[1:].strip())
+                except ValueError:
+                    self.message_panel.create_error_message("Enter 'g' followed by a row number, e.g. 'g 500'.")
+                    continue
+                if not (1 <= row_number <= row_count):
+                    self.message_panel.create_error_message(f"Enter a row number from 1 to {row_count}.")
+                    continue
+                self.view_start = (row_number - 1) // page_size * page_size
+            elif response == ">":
+                if self.view_first_column + column_count < total_columns:
+                    self.view_first_column += column_count
+            elif response == "<":
+                self.view_first_column -= column_count
+            elif response == "q":
+                return
+            else:
+                self.message_panel.create_error_message("Invalid input.")
 
     def print_table_data(self) -> Panel:
         """
@@ -779,7 +1901,10 @@ class TableBuilder:
         """
         Clears the table data.
         """
-        self.table_data = {"columns": [], "rows": []}
+        self.table_data = {"columns": [], "rows": ColumnStore()}
+        self.change_tracker.reset()
+        self.view_start = self.view_first_column = 0
+        self.render_cache.reset()
         self.message_panel.create_information_message("Table cleared.")
 
     def launch_builder(self) -> None:
@@ -830,6 +1955,12 @@ class TableBuilder:
                 if self.settings.get_autoprint_table() == "on":
                     self.print_table()
 
+            elif builder_command == "filter rows":
+                self.filter_rows()
+
+            elif builder_command == "count values":
+                self.count_values()
+
             elif builder_command == "print table":
                 self.print_table()
 
@@ -856,6 +1987,18 @@ class TableBuilder:
             elif builder_command == "load csv":
                 self.load_csv()
                 
+            elif builder_command == "import csv":
+                self.import_csv_to_database()
+
+            elif builder_command == "load ndjson":
+                self.load_ndjson()
+
+            elif builder_command == "save snapshot":
+                self.save_snapshot()
+
+            elif builder_command == "load snapshot":
+                self.load_snapshot()
+
             elif builder_command == "load csv batch":
                 self.load_batch_csv()
             
@@ -865,12 +2008,21 @@ class TableBuilder:
             elif builder_command == "save csv":
                 self.save_to_csv()
                 
+            elif builder_command == "export csv":
+                self.export_table_to_csv()
+
+            elif builder_command == "export all":
+                self.export_all()
+
             elif builder_command == "save pdf":
                 self.save_table_to_pdf()
 
             elif builder_command == "save json":
                 self.save_to_json()
 
+            elif builder_command == "save ndjson":
+                self.save_to_ndjson()
+
             elif builder_command == "help":
                 self.message_panel.print_table_builder_instructions()
 
@@ -0,0 +1,197 @@
+import random
+import re
+
+
+# Rows read from the top of a file, and rows sampled from the rest, to guess column types
+HEAD_SAMPLE_SIZE = 1000
+RESERVOIR_SAMPLE_SIZE = 1000
+
+INT_PATTERN = re.compile(r"[+-]?\d+")
+FLOAT_PATTERN = re.compile(r"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+BOOL_VALUES = {"true", "false"}
+
+# Numbers written with leading zeros, such as zip codes and padded IDs, are kept as text so
+# the zeros are not lost
+LEADING_ZERO_PATTERN = re.compile(r"[+-]?0\d")
+
+# SQLite stores integers in 64 bits. Longer whole numbers are kept as text, as they would
+# lose digits as floats.
+MIN_INT = -2 ** 63
+MAX_INT = 2 ** 63 - 1
+
+# When a value does not fit its column's type, the column falls back to the next type
+FALLBACK_TYPES = {"bool": "str", "int": "float", "float": "str", "str": None}
+
+
+class RowSampler:
+    def __init__(self, head_size: int = HEAD_SAMPLE_SIZE, reservoir_size: int = RESERVOIR_SAMPLE_SIZE):
+        """
+        Keep a sample of the rows passed through it: the first head_size rows, plus a
+        uniform reservoir sample of reservoir_size rows from everything after them.
+
+        :param head_size: The number of rows kept from the start.
+        :param reservoir_size: The number of rows sampled from the rest.
+        """
+        self.head_size = head_size
+        self.reservoir_size = reservoir_size
+        self.head = []
+        self.reservoir = []
+        self.seen = 0
+        self.random = random.Random(0)
+
+    def add(self, row) -> None:
+        """
+        Offer a row to the sample.
+        """
+        self.seen += 1
+        if len(self.head) < self.head_size:
+            self.head.append(row)
+            return
+
+        # Algorithm R over the rows after the head
+        seen_after_head = self.seen - self.head_size
+        if len(self.reservoir) < self.reservoir_size:
+            self.reservoir.append(row)
+        else:
+            slot = self.random.randrange(seen_after_head)
+            if slot < self.reservoir_size:
+                self.reservoir[slot] = row
+
+    def rows(self) -> list:
+        return self.head + self.reservoir
+
+
+def is_plain_integer(value: str) -> bool:
+    """
+    Check if a string of digits has no leading zeros and fits in 64 bits.
+    """
+    if LEADING_ZERO_PATTERN.match(value):
+        return False
+    # Up to 18 digits always fit, so only longer numbers are converted to check
+    return len(value) < 19 or MIN_INT <= int(value) <= MAX_INT
+
+
+def value_fits(value: str, data_type: str) -> bool:
+    """
+    Check if a raw CSV value can be stored as a type. Empty values fit every type.
+
+    :param value: The raw value.
+    :param data_type: One of 'int', 'float', 'bool' or 'str'.
+    """
+    if value == "" or value is None or data_type == "str":
+        return True
+    value = value.strip()
+    if data_type == "int":
+        return INT_PATTERN.fullmatch(value) is not None and is_plain_integer(value)
+    if data_type == "float":
+        if FLOAT_PATTERN.fullmatch(value) is None or LEADING_ZERO_PATTERN.match(value):
+            return False
+        return INT_PATTERN.fullmatch(value) is None or is_plain_integer(value)
+    if data_type == "bool":
+        return value.lower() in BOOL_VALUES
+    return False
+
+
+def fit_type(values, data_type: str) -> str:
+    """
+    Find the narrowest type, starting from data_type, that every value fits.
+
+    :param values: The raw values of one column.
+    :param data_type: The type to start from.
+    :return: The type, falling back through FALLBACK_TYPES as values fail to fit.
+    """
+    for value in values:
+        while not value_fits(value, data_type):
+            data_type = FALLBACK_TYPES[data_type]
+        if data_type == "str":
+            break
+    return data_type
+
+
+def infer_column_type(values) -> str:
+    """
+    Guess the type of a column from a sample of its raw values.
+
+    :param values: The sampled raw values.
+    :return: 'bool', 'int', 'float' or 'str'.
+    """
+    values = [value for value in values if value not in ("", None)]
+    if not values:
+        return "str"
+    if all(value_fits(value, "bool") for value in values):
+        return "bool"
+    return fit_type(values, "int")
+
+
+def infer_column_types(sample_rows: list, width: int) -> list:
+    """
+    Guess the type of every column from a sample of rows.
+
+    :param sample_rows: The sampled rows, as lists of raw values.
+    :param width: The number of columns.
+    :return: One type per column.
+    """
+    return [infer_column_type(row[index] for row in sample_rows if index < len(row)) for index in range(width)]
+
+
+def convert_value(value: str, data_type: str):
+    """
+    Convert a raw CSV value that fits a type. Empty values become None unless the type is 'str'.
+
+    :param value: The raw value.
+    :param data_type: One of 'int', 'float', 'bool' or 'str'.
+    """
+    if data_type == "str":
+        return value
+    if value == "" or value is None:
+        return None
+    if data_type == "int":
+        return int(value)
+    if data_type == "float":
+        return float(value)
+    return value.strip().lower() == "true"
+
+
+def convert_column(values: list, data_type: str) -> list:
+    """
+    Convert the raw values of one column, keeping any value that does not fit as it is.
+
+    :param values: The raw values.
+    :param data_type: The column's type.
+    :return: The converted values.
+    """
+    if data_type == "str":
+        return list(values)
+    return [convert_value(value, data_type) if value_fits(value, data_type) else value for value in values]
+
+
+def widen_column_types(rows: list, column_types: list) -> list:
+    """
+    Widen the type of each column until every value of a chunk of raw rows fits it.
+
+    :param rows: The raw rows, all as wide as column_types.
+    :param column_types: The type of each column so far.
+    :return: The type each column needs.
+    """
+    return [fit_type(values, data_type) for values, data_type in zip(zip(*rows), column_types)]
+
+
+def convert_rows(rows: list, column_types: list) -> tuple:
+    """
+    Convert a chunk of raw rows one column at a time, and find the types the columns need.
+
+    A value that does not fit its column's type is kept as it is, and the column's type is
+    widened until it fits, so the caller can tell that the types it guessed were too narrow.
+
+    :param rows: The raw rows, all as wide as column_types.
+    :param column_types: The type of each column.
+    :return: The converted rows, as tuples, and the type each column needs.
+    """
+    raw_columns = list(zip(*rows))
+    converted = [convert_column(values, data_type) for values, data_type in zip(raw_columns, column_types)]
+    # Values that did not fit are the only text left in a column that is not 'str'
+    needed_types = [
+        fit_type(raw, data_type) if data_type != "str" and str in set(map(type, values)) else data_type
+        for raw, values, data_type in zip(raw_columns, converted, column_types)
+    ]
+    return list(zip(*converted)), needed_types